@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+import numpy as np
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def _is_float(value: Any) -> bool:
+    return isinstance(value, (float, np.floating))
+
+
+class ColumnarFrame:
+    # Column-oriented stand-in for a list of row dicts that all share the same keys. Numbers
+    # live in int64/float64 arrays (with a mask where a value was None), strings are
+    # dictionary-encoded, anything else stays a plain list. to_records() rebuilds equal rows.
+
+    __slots__ = ("columns", "length", "data")
+
+    def __init__(self, columns: list[str], length: int, data: dict[str, tuple[Any, ...]]):
+        self.columns = columns
+        self.length = length
+        self.data = data
+
+    @classmethod
+    def from_records(cls, rows: list[dict[str, Any]]) -> ColumnarFrame | None:
+        # None when the rows do not share one key layout; callers keep the list as is.
+        if not rows:
+            return None
+        columns = list(rows[0])
+        keys = rows[0].keys()
+        if any(row.keys() != keys for row in rows):
+            return None
+        data = {}
+        for column in columns:
+            values = [row[column] for row in rows]
+            present = [v for v in values if v is not None]
+            missing = np.array([v is None for v in values], dtype=bool) if len(present) < len(values) else None
+            if present and all(_is_int(v) for v in present) and all(-(2**63) <= v < 2**63 for v in present):
+                data[column] = ("int", np.array([0 if v is None else v for v in values], dtype=np.int64), missing)
+            elif present and all(_is_float(v) for v in present):
+                data[column] = ("float", np.array([np.nan if v is None else v for v in values], dtype=np.float64), missing)
+            elif all(isinstance(v, str) for v in present):
+                lookup: dict[str, int] = {}
+                codes = [-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values]
+                dtype = np.int16 if len(lookup) < 2**15 else np.int32
+                data[column] = ("dict", np.array(codes, dtype=dtype), list(lookup))
+            else:
+                data[column] = ("object", values)
+        return cls(columns, len(rows), data)
+
+    def _column_values(self, column: str) -> list[Any]:
+        kind, *payload = self.data[column]
+        if kind == "object":
+            return payload[0]
+        if kind == "dict":
+            codes, values = payload
+            return [None if code < 0 else values[code] for code in codes.tolist()]
+        array, missing = payload
+        out = array.tolist()
+        if missing is not None:
+            for index in np.flatnonzero(missing).tolist():
+                out[index] = None
+        return out
+
+    def to_records(self) -> list[dict[str, Any]]:
+        columns = self.columns
+        return [dict(zip(columns, values)) for values in zip(*(self._column_values(c) for c in columns))]
+
+    def __len__(self) -> int:
+        return self.length
+
+    def nbytes(self) -> int:
+        total = sys.getsizeof(self.columns)
+        for kind, *payload in self.data.values():
+            if kind == "object":
+                total += sys.getsizeof(payload[0]) + sum(sys.getsizeof(v) for v in payload[0])
+            elif kind == "dict":
+                total += payload[0].nbytes + sys.getsizeof(payload[1]) + sum(sys.getsizeof(v) for v in payload[1])
+            else:
+                total += payload[0].nbytes + (payload[1].nbytes if payload[1] is not None else 0)
+        return total
+
+
+def compact_content(content: dict[str, Any]) -> dict[str, Any]:
+    # Row lists inside cached query content are stored as ColumnarFrame where possible.
+    out = {}
+    for key, value in content.items():
+        frame = None
+        if isinstance(value, list) and value and all(isinstance(row, dict) for row in value):
+            frame = ColumnarFrame.from_records(value)
+        out[key] = frame if frame is not None else value
+    return out
+
+
+def expand_content(content: dict[str, Any]) -> dict[str, Any]:
+    return {k: v.to_records() if isinstance(v, ColumnarFrame) else v for k, v in content.items()}
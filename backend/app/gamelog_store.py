@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+SCHEMA_VERSION = 3
+COLUMNAR_FORMAT = "columnar-v1"
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+STAT_COLUMNS = [
+    "MIN", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB",
+    "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS", "PLUS_MINUS", "FANTASY_PTS",
+]
+# Shooting percentages are aggregated as made / attempted rather than as a mean of games.
+PCT_COLUMNS = {"FG_PCT": ("FGM", "FGA"), "FG3_PCT": ("FG3M", "FG3A"), "FT_PCT": ("FTM", "FTA")}
+# Group name -> (GROUP BY expression, selected columns).
+GROUP_COLUMNS = {
+    "player": ("player_id", ["player_id", "MAX(player_name) AS player_name"]),
+    "team": ("team", ["team"]),
+    "opponent": ("opponent", ["opponent"]),
+    "season": ("season", ["season"]),
+    "season_type": ("season_type", ["season_type"]),
+    "home": ("home", ["home"]),
+    "game_date": ("game_date", ["game_date"]),
+    "month": ("substr(game_date, 1, 7)", ["substr(game_date, 1, 7) AS month"]),
+}
+GAME_COLUMNS = ["season", "season_type", "game_date", "game_id", "player_id", "player_name", "team", "opponent", "home", "wl"]
+AGGREGATES = {"avg": "AVG", "sum": "SUM", "max": "MAX", "min": "MIN"}
+QUERY_MAX_ROWS = 5000
+MATCHUP = re.compile(r"^\s*(?P<team>\w+)\s+(?P<sep>vs\.?|@)\s+(?P<opponent>\w+)", re.IGNORECASE)
+
+
+INSERT_GAMELOG = (
+    "INSERT INTO gamelogs (source, season, season_type, player_id, player_name, team, opponent, home, wl,"
+    " game_id, game_date, {stats}, row) VALUES ({marks})".format(
+        stats=", ".join(f'"{c}"' for c in STAT_COLUMNS), marks=", ".join("?" * (12 + len(STAT_COLUMNS)))
+    )
+)
+
+
+HOME_VALUES = {"true": 1, "1": 1, "home": 1, "false": 0, "0": 0, "away": 0}
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+def _filter_values(key: str, value: Any) -> list[Any]:
+    # Filters come straight from a JSON body; anything but scalars (or a list of them for the
+    # IN filters) is rejected with ValueError instead of failing inside set lookups or SQL.
+    values = value if isinstance(value, list) and key in {"player_id", "team", "opponent", "wl"} else [value]
+    for v in values:
+        if not isinstance(v, (str, int, float)):
+            raise ValueError(f"filter {key} must be a string or number, or a list of them")
+    if key == "player_id":
+        try:
+            return [int(v) for v in values]
+        except ValueError as exc:
+            raise ValueError("filter player_id must be an integer") from exc
+    if key == "home":
+        home = HOME_VALUES.get(str(value).lower())
+        if home is None:
+            raise ValueError("filter home must be true/false, 1/0 or home/away")
+        return [home]
+    if key in {"date_from", "date_to"}:
+        if not isinstance(value, str) or not ISO_DATE.match(value):
+            raise ValueError(f"filter {key} must be a YYYY-MM-DD date")
+        return [value[:10]]
+    return [str(v).upper() for v in values]
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        out = float(value)
+    except (TypeError, ValueError):
+        return None
+    return out if out == out else None
+
+
+def _decode_rows(payload: dict[str, Any]) -> list[dict[str, Any]]:
+    # Gamelog files are either row dicts or the columnar encoding from build_static_data.py.
+    if payload.get("format") != COLUMNAR_FORMAT:
+        return payload.get("rows") or []
+    columns = payload.get("columns") or []
+    dictionaries = payload.get("dictionaries") or {}
+    date_columns = set(payload.get("date_columns") or [])
+    decoded = []
+    for column in columns:
+        raw = payload["values"][column]
+        if column in dictionaries:
+            lookup = dictionaries[column]
+            raw = [None if v is None else lookup[v] for v in raw]
+        elif column in date_columns:
+            raw = [None if v is None else date.fromordinal(v + EPOCH_ORDINAL).isoformat() for v in raw]
+        decoded.append(raw)
+    return [dict(zip(columns, values)) for values in zip(*decoded)]
+
+
+class GamelogStore:
+    # SQLite index over the gamelog files written by scripts/build_static_data.py: weekly
+    # partitions listed by a per-season index, or one file per season for older manifests.
+    # Files are (re)ingested whenever their size or mtime changes, so the nightly refresh is
+    # picked up without a restart and only touches the partitions it rewrote.
+
+    def __init__(self, db_path: Path, data_dir: Path, sync_seconds: float = 60.0):
+        self.db_path = db_path
+        self.data_dir = data_dir
+        self.sync_seconds = sync_seconds
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._synced_at = 0.0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate(conn)
+            self._local.conn = conn
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        conn.executescript(
+            """
+            DROP TABLE IF EXISTS gamelogs;
+            DROP TABLE IF EXISTS sources;
+            CREATE TABLE gamelogs (
+                source TEXT NOT NULL,
+                season TEXT NOT NULL,
+                season_type TEXT NOT NULL,
+                player_id INTEGER NOT NULL,
+                player_name TEXT,
+                team TEXT,
+                opponent TEXT,
+                home INTEGER,
+                wl TEXT,
+                game_id TEXT,
+                game_date TEXT,
+                {stat_columns},
+                row TEXT NOT NULL
+            );
+            CREATE INDEX gamelogs_player ON gamelogs (player_id, season, season_type, game_date);
+            CREATE INDEX gamelogs_source ON gamelogs (source);
+            CREATE INDEX gamelogs_date ON gamelogs (season, season_type, game_date);
+            CREATE INDEX gamelogs_team ON gamelogs (team, season, season_type, game_date);
+            CREATE INDEX gamelogs_opponent ON gamelogs (opponent, season, season_type, game_date);
+            CREATE TABLE sources (
+                path TEXT PRIMARY KEY,
+                season TEXT NOT NULL,
+                season_type TEXT NOT NULL,
+                signature TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                stat_fields TEXT NOT NULL,
+                loaded_at REAL NOT NULL
+            );
+            """.format(stat_columns=",\n                ".join(f'"{c}" REAL' for c in STAT_COLUMNS))
+        )
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _manifest_sources(self) -> list[tuple[str, Path]]:
+        try:
+            manifest = json.loads((self.data_dir / "manifest.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        partitioned = bool(manifest.get("gamelog_layout"))
+        out: list[tuple[str, Path]] = []
+        for season, by_type in (manifest.get("files", {}).get("gamelogs") or {}).items():
+            for entry in (by_type or {}).values():
+                # Entries are {path, sha256, bytes, rows}; older manifests stored bare paths.
+                rel = entry.get("path") if isinstance(entry, dict) else entry
+                if not partitioned:
+                    out.append((season, self.data_dir / rel))
+                    continue
+                try:
+                    index = json.loads((self.data_dir / rel).read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    continue
+                for partition in index.get("partitions") or []:
+                    out.append((season, self.data_dir / partition["path"]))
+        return out
+
+    @staticmethod
+    def _signature(path: Path) -> str | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def sync(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._synced_at < self.sync_seconds:
+            return
+        with self._sync_lock:
+            if not force and now - self._synced_at < self.sync_seconds:
+                return
+            conn = self._conn()
+            sources = self._manifest_sources()
+            wanted = {str(path) for _, path in sources}
+            stale = [path for (path,) in conn.execute("SELECT path FROM sources") if path not in wanted]
+            if sources and stale:
+                self._drop(conn, stale)
+            for season, path in sources:
+                signature = self._signature(path)
+                if signature is None:
+                    continue
+                current = conn.execute(
+                    "SELECT 1 FROM sources WHERE path = ? AND signature = ?", (str(path), signature)
+                ).fetchone()
+                if current is None:
+                    self._ingest(conn, season, path, signature)
+            self._synced_at = time.monotonic()
+
+    def _drop(self, conn: sqlite3.Connection, paths: list[str]) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for path in paths:
+                conn.execute("DELETE FROM gamelogs WHERE source = ?", (path,))
+                conn.execute("DELETE FROM sources WHERE path = ?", (path,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _ingest(self, conn: sqlite3.Connection, season: str, path: Path, signature: str) -> None:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        season_type = str(payload.get("season_type") or "")
+        rows = _decode_rows(payload)
+        records = []
+        for row in rows:
+            try:
+                player_id = int(row.get("PLAYER_ID"))
+            except (TypeError, ValueError):
+                continue
+            matchup = MATCHUP.match(str(row.get("MATCHUP") or ""))
+            records.append(
+                (
+                    str(path),
+                    season,
+                    season_type,
+                    player_id,
+                    str(row.get("PLAYER_NAME") or ""),
+                    str(row.get("TEAM_ABBREVIATION") or (matchup and matchup["team"]) or ""),
+                    matchup["opponent"].upper() if matchup else None,
+                    (0 if matchup["sep"] == "@" else 1) if matchup else None,
+                    row.get("WL"),
+                    str(row.get("GAME_ID") or ""),
+                    str(row.get("GAME_DATE") or "")[:10],
+                    *(_to_float(row.get(column)) for column in STAT_COLUMNS),
+                    json.dumps(row, separators=(",", ":")),
+                )
+            )
+
+        # Another worker may have ingested the same file while this one was parsing it.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = conn.execute(
+                "SELECT 1 FROM sources WHERE path = ? AND signature = ?", (str(path), signature)
+            ).fetchone()
+            if current is None:
+                conn.execute("DELETE FROM gamelogs WHERE source = ?", (str(path),))
+                conn.executemany(INSERT_GAMELOG, records)
+                conn.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        str(path),
+                        season,
+                        season_type,
+                        signature,
+                        len(records),
+                        json.dumps(payload.get("stat_fields") or []),
+                        time.time(),
+                    ),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def player_rows(self, player_id: int, season: str, season_type: str) -> list[dict[str, Any]]:
+        self.sync()
+        cursor = self._conn().execute(
+            "SELECT row FROM gamelogs WHERE player_id = ? AND season = ? AND season_type = ?"
+            " ORDER BY game_date",
+            (int(player_id), season, season_type),
+        )
+        return [json.loads(row) for (row,) in cursor]
+
+    def sources(self, season: str, season_type: str) -> dict[str, tuple[str, list[str]]]:
+        # {path: (signature, stat_fields)} for one season type, after syncing with the manifest.
+        self.sync()
+        cursor = self._conn().execute(
+            "SELECT path, signature, stat_fields FROM sources WHERE season = ? AND season_type = ?",
+            (season, season_type),
+        )
+        return {path: (signature, json.loads(stat_fields)) for path, signature, stat_fields in cursor}
+
+    def source_rows(self, path: str) -> list[dict[str, Any]]:
+        cursor = self._conn().execute("SELECT row FROM gamelogs WHERE source = ?", (path,))
+        return [json.loads(row) for (row,) in cursor]
+
+    def query(
+        self,
+        seasons: list[str],
+        season_type: str | None = None,
+        filters: dict[str, Any] | None = None,
+        group_by: list[str] | None = None,
+        stats: list[str] | None = None,
+        agg: str = "avg",
+        order_by: str | None = None,
+        descending: bool = True,
+        limit: int = 50,
+        min_games: int = 0,
+    ) -> dict[str, Any]:
+        # Filter / group / aggregate over the indexed columns. Without group_by single games are
+        # returned, e.g. the top PTS games against one opponent. Raises ValueError on bad input.
+        self.sync()
+        stats = stats or ["PTS", "REB", "AST"]
+        unknown = [s for s in stats if s not in STAT_COLUMNS]
+        if unknown:
+            raise ValueError(f"unknown stats: {', '.join(unknown)}")
+        group_by = group_by or []
+        unknown = [g for g in group_by if g not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"unknown group_by: {', '.join(unknown)} (use {', '.join(GROUP_COLUMNS)})")
+        if agg not in AGGREGATES:
+            raise ValueError(f"agg must be one of {', '.join(AGGREGATES)}")
+        if not seasons:
+            raise ValueError("at least one season is required")
+
+        where = [f"season IN ({', '.join('?' * len(seasons))})"]
+        args: list[Any] = list(seasons)
+        if season_type:
+            where.append("season_type = ?")
+            args.append(season_type)
+        if filters is not None and not isinstance(filters, dict):
+            raise ValueError("filters must be an object")
+        for key, value in (filters or {}).items():
+            if value is None or value == "" or value == []:
+                continue
+            if key in {"player_id", "team", "opponent", "wl"}:
+                values = _filter_values(key, value)
+                where.append(f"{key} IN ({', '.join('?' * len(values))})")
+                args.extend(values)
+            elif key == "home":
+                where.append("home = ?")
+                args.extend(_filter_values(key, value))
+            elif key == "date_from":
+                where.append("game_date >= ?")
+                args.extend(_filter_values(key, value))
+            elif key == "date_to":
+                where.append("game_date <= ?")
+                args.extend(_filter_values(key, value))
+            else:
+                raise ValueError(f"unknown filter: {key}")
+
+        if group_by:
+            columns = [c for g in group_by for c in GROUP_COLUMNS[g][1]]
+            function = AGGREGATES[agg]
+            for stat in stats:
+                if stat in PCT_COLUMNS and agg in {"avg", "sum"}:
+                    made, attempted = PCT_COLUMNS[stat]
+                    expression = f'SUM("{made}") / NULLIF(SUM("{attempted}"), 0)'
+                else:
+                    expression = f'{function}("{stat}")'
+                columns.append(f'ROUND({expression}, 3) AS "{stat}"')
+            columns.append("COUNT(*) AS games")
+            tail = " GROUP BY " + ", ".join(GROUP_COLUMNS[g][0] for g in group_by)
+            if min_games > 0:
+                tail += " HAVING COUNT(*) >= ?"
+                args.append(int(min_games))
+            sortable = {*stats, "games", *(c.rsplit(" AS ", 1)[-1] for g in group_by for c in GROUP_COLUMNS[g][1])}
+        else:
+            columns = [*GAME_COLUMNS, *(f'"{stat}"' for stat in stats)]
+            tail = ""
+            sortable = {*stats, *GAME_COLUMNS}
+
+        order_by = order_by or stats[0]
+        if order_by not in sortable:
+            raise ValueError(f"order_by must be one of {', '.join(sorted(sortable))}")
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            f"SELECT {', '.join(columns)} FROM gamelogs WHERE {' AND '.join(where)}{tail}"
+            f' ORDER BY ("{order_by}" IS NULL), "{order_by}" {direction} LIMIT ?'
+        )
+        args.append(max(1, min(int(limit), QUERY_MAX_ROWS)))
+
+        started = time.perf_counter()
+        cursor = self._conn().execute(sql, args)
+        names = [d[0] for d in cursor.description]
+        rows = [dict(zip(names, values)) for values in cursor]
+        return {
+            "seasons": seasons,
+            "season_type": season_type,
+            "group_by": group_by,
+            "agg": agg if group_by else None,
+            "stats": stats,
+            "order_by": order_by,
+            "columns": names,
+            "row_count": len(rows),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+            "rows": rows,
+        }
+
+    def recent_profiles(
+        self,
+        season: str,
+        season_type: str,
+        stats: list[str],
+        window: int,
+        min_games: int,
+        player_ids: list[int] | None = None,
+    ) -> list[tuple[Any, ...]]:
+        # (player_id, name, games, mean of each stat) over each player's last `window` games.
+        stats = [stat for stat in stats if stat in STAT_COLUMNS]
+        if not stats:
+            # No local gamelogs for this season type, so nothing to profile.
+            return []
+        averages = ", ".join(f'AVG("{stat}")' for stat in stats)
+        where = "season = ? AND season_type = ?"
+        args: list[Any] = [season, season_type]
+        if player_ids is not None:
+            where += f" AND player_id IN ({', '.join('?' * len(player_ids))})"
+            args.extend(int(pid) for pid in player_ids)
+        self.sync()
+        return self._conn().execute(
+            f"SELECT player_id, MAX(player_name), COUNT(*), {averages} FROM ("
+            " SELECT *, ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC) AS recent"
+            f" FROM gamelogs WHERE {where}"
+            ") WHERE recent <= ? GROUP BY player_id HAVING COUNT(*) >= ? ORDER BY player_id",
+            [*args, int(window), int(min_games)],
+        ).fetchall()
+
+    def players_by_source(self, season: str, season_type: str) -> dict[str, list[int]]:
+        self.sync()
+        out: dict[str, list[int]] = {}
+        cursor = self._conn().execute(
+            "SELECT source, player_id FROM gamelogs WHERE season = ? AND season_type = ?"
+            " GROUP BY source, player_id ORDER BY source, player_id",
+            (season, season_type),
+        )
+        for source, player_id in cursor:
+            out.setdefault(source, []).append(int(player_id))
+        return out
+
+    def version(self) -> str:
+        # Changes whenever any source file is (re)ingested; used to key derived response caches.
+        self.sync()
+        count, loaded_at, rows = self._conn().execute(
+            "SELECT COUNT(*), MAX(loaded_at), SUM(row_count) FROM sources"
+        ).fetchone()
+        return f"{count}:{rows or 0}:{loaded_at or 0}"
+
+    def describe(self) -> dict[str, Any]:
+        self.sync()
+        rows = self._conn().execute(
+            "SELECT season, season_type, SUM(row_count), MAX(loaded_at) FROM sources"
+            " GROUP BY season, season_type ORDER BY season, season_type"
+        ).fetchall()
+        return {
+            "path": str(self.db_path),
+            "data_dir": str(self.data_dir),
+            "sources": [
+                {"season": season, "season_type": season_type, "rows": count, "loaded_at": loaded_at}
+                for season, season_type, count, loaded_at in rows
+            ],
+        }
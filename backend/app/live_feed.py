@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+
+def diff_payload(old: Any, new: Any, path: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
+    # Minimal add/remove/replace operations turning `old` into `new`. Lists of equal length are
+    # compared item by item (box score player lists keep their order); anything else is replaced.
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, Any]] = [{"op": "remove", "path": [*path, k]} for k in old if k not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": [*path, key], "value": value})
+            elif old[key] != value:
+                ops.extend(diff_payload(old[key], value, (*path, key)))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (a, b) in enumerate(zip(old, new)):
+            if a != b:
+                ops.extend(diff_payload(a, b, (*path, index)))
+        return ops
+    return [{"op": "replace", "path": list(path), "value": new}]
+
+
+class LiveHub:
+    # One polling task per topic (live endpoint + params), shared by every subscriber in this
+    # process. Subscribers get the latest snapshot on join and then only the changes; the task
+    # stops once a topic has had no subscribers for idle_seconds.
+
+    def __init__(
+        self,
+        fetch: Callable[[str, dict[str, Any]], Awaitable[Any]],
+        interval: float = 10.0,
+        idle_seconds: float = 30.0,
+        queue_size: int = 32,
+    ):
+        self.fetch = fetch
+        self.interval = max(1.0, interval)
+        self.idle_seconds = max(0.0, idle_seconds)
+        self.queue_size = max(1, queue_size)
+        self.stats = {"polls": 0, "changes": 0, "errors": 0, "resyncs": 0}
+        self._topics: dict[str, dict[str, Any]] = {}
+
+    def subscribe(self, topic: str, endpoint: str, params: dict[str, Any]) -> asyncio.Queue:
+        state = self._topics.get(topic)
+        if state is None:
+            state = self._topics[topic] = {
+                "endpoint": endpoint,
+                "params": params,
+                "subscribers": set(),
+                "payload": None,
+                "seq": 0,
+                "polled_at": None,
+                "idle_since": None,
+            }
+            state["task"] = asyncio.create_task(self._poll(topic, state))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        state["subscribers"].add(queue)
+        state["idle_since"] = None
+        if state["payload"] is not None:
+            queue.put_nowait(self._snapshot(state))
+        return queue
+
+    def unsubscribe(self, topic: str, queue: asyncio.Queue) -> None:
+        state = self._topics.get(topic)
+        if state is None:
+            return
+        state["subscribers"].discard(queue)
+        if not state["subscribers"]:
+            state["idle_since"] = time.monotonic()
+
+    @staticmethod
+    def _snapshot(state: dict[str, Any]) -> dict[str, Any]:
+        return {"event": "snapshot", "seq": state["seq"], "payload": state["payload"]}
+
+    def _publish(self, state: dict[str, Any], message: dict[str, Any]) -> None:
+        for queue in list(state["subscribers"]):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A subscriber that fell behind skips the backlog and resyncs from a snapshot.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._snapshot(state))
+                self.stats["resyncs"] += 1
+
+    async def _poll(self, topic: str, state: dict[str, Any]) -> None:
+        try:
+            while True:
+                idle_since = state["idle_since"]
+                if idle_since is not None and time.monotonic() - idle_since >= self.idle_seconds:
+                    return
+                started = time.monotonic()
+                try:
+                    payload = await self.fetch(state["endpoint"], state["params"])
+                except Exception as exc:
+                    self.stats["errors"] += 1
+                    self._publish(state, {"event": "error", "detail": str(getattr(exc, "detail", exc))})
+                else:
+                    self.stats["polls"] += 1
+                    state["polled_at"] = time.time()
+                    if state["payload"] is None:
+                        state["payload"] = payload
+                        self._publish(state, self._snapshot(state))
+                    else:
+                        ops = diff_payload(state["payload"], payload)
+                        if ops:
+                            state["payload"] = payload
+                            state["seq"] += 1
+                            self.stats["changes"] += 1
+                            self._publish(state, {"event": "patch", "seq": state["seq"], "ops": ops})
+                await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            self._topics.pop(topic, None)
+
+    async def close(self) -> None:
+        tasks = [state["task"] for state in self._topics.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "topics": [
+                {
+                    "endpoint": state["endpoint"],
+                    "params": state["params"],
+                    "subscribers": len(state["subscribers"]),
+                    "seq": state["seq"],
+                    "polled_at": state["polled_at"],
+                }
+                for state in self._topics.values()
+            ],
+            **self.stats,
+        }
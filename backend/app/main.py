@@ -1,37 +1,122 @@
 from __future__ import annotations
 
+import asyncio
+import gzip
 import hashlib
 import importlib
 import inspect
+import json
 import math
 import os
+import pickle
 import pkgutil
 import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+import httpx
+import orjson
 from diskcache import Cache
 from dotenv import load_dotenv
-from fastapi import Body, FastAPI, HTTPException, Query
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from nba_api.live.nba.library.http import NBALiveHTTP
 from nba_api.stats.endpoints import boxscoreplayertrackv3, commonallplayers
+from nba_api.stats.library.http import NBAStatsHTTP
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from .columnar import compact_content, expand_content
+from .gamelog_store import GamelogStore
+from .live_feed import LiveHub
+from .similarity import SIMILARITY_METRICS, SimilarityIndex
+from .tiered_cache import TieredCache
+from .tracking_store import TrackingWarehouse
+from .trend_scan import SCAN_SORTS, TrendScanner
 
 load_dotenv()
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 HEADSHOT_DIR = Path(os.getenv("HEADSHOT_DIR", str(ROOT_DIR))).resolve()
+HEADSHOT_ASSET_DIR = Path(
+    os.getenv("HEADSHOT_ASSET_DIR", str(ROOT_DIR / "frontend" / "public" / "headshots"))
+).resolve()
+HEADSHOT_SPRITE_SIZE = int(os.getenv("HEADSHOT_SPRITE_SIZE", "48"))
 TEAM_LOGO_DIR = Path(
     os.getenv("TEAM_LOGO_DIR", "/Users/atticusobp/Desktop/team graphs")
 ).resolve()
 DEFAULT_SEASON = os.getenv("DEFAULT_SEASON", "2025-26")
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "21600"))
-CACHE_DIR = ROOT_DIR / ".cache"
+LIVE_TTL_SECONDS = int(os.getenv("LIVE_TTL_SECONDS", "10"))
+LIVE_POLL_SECONDS = float(os.getenv("LIVE_POLL_SECONDS", "10"))
+LIVE_IDLE_SECONDS = float(os.getenv("LIVE_IDLE_SECONDS", "30"))
+LIVE_KEEPALIVE_SECONDS = 15.0
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(ROOT_DIR / ".cache"))).resolve()
+WARM_TIER_MAX_ITEMS = int(os.getenv("WARM_TIER_MAX_ITEMS", "256"))
+WARM_TIER_SYNC_SECONDS = float(os.getenv("WARM_TIER_SYNC_SECONDS", "1.0"))
+FILL_LOCK_SECONDS = float(os.getenv("FILL_LOCK_SECONDS", "45"))
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+STATIC_DATA_DIR = Path(
+    os.getenv("STATIC_DATA_DIR", str(ROOT_DIR / "frontend" / "public" / "data"))
+).resolve()
+TRACKING_WAREHOUSE_DIR = Path(
+    os.getenv("TRACKING_WAREHOUSE_DIR", str(ROOT_DIR / ".warehouse" / "tracking"))
+).resolve()
+GAMELOG_STORE_PATH = Path(os.getenv("GAMELOG_STORE_PATH", str(CACHE_DIR / "gamelogs.sqlite3"))).resolve()
+SIMILARITY_DIR = Path(os.getenv("SIMILARITY_DIR", str(CACHE_DIR / "similarity"))).resolve()
+SIMILARITY_WINDOW = int(os.getenv("SIMILARITY_WINDOW", "10"))
+UPSTREAM_MIN_INTERVAL_SECONDS = float(os.getenv("UPSTREAM_MIN_INTERVAL_SECONDS", "0.6"))
+UPSTREAM_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", "30"))
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "20"))
+NEGATIVE_NODATA_TTL_SECONDS = int(os.getenv("NEGATIVE_NODATA_TTL_SECONDS", "1800"))
+NEGATIVE_ERROR_TTL_SECONDS = int(os.getenv("NEGATIVE_ERROR_TTL_SECONDS", "60"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "60"))
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1").strip().lower() in {"1", "true", "yes", "y"}
+WARMUP_HOUR = int(os.getenv("WARMUP_HOUR", "5"))
+WARMUP_LOCK_SECONDS = int(os.getenv("WARMUP_LOCK_SECONDS", "900"))
+WARMUP_SEASON_TYPE = os.getenv("WARMUP_SEASON_TYPE", "Regular Season")
+WARMUP_TOP_PLAYERS = int(os.getenv("WARMUP_TOP_PLAYERS", "25"))
+WARMUP_TRACKING_MEASURES = [
+    x.strip()
+    for x in os.getenv("WARMUP_TRACKING_MEASURES", "Passing,Rebounding,Possessions").split(",")
+    if x.strip()
+]
 
 cache = Cache(str(CACHE_DIR))
+tiers = TieredCache(cache, max_items=WARM_TIER_MAX_ITEMS, sync_seconds=WARM_TIER_SYNC_SECONDS)
+gamelog_store = GamelogStore(GAMELOG_STORE_PATH, STATIC_DATA_DIR)
+tracking_warehouse = TrackingWarehouse(TRACKING_WAREHOUSE_DIR)
+trend_scanner = TrendScanner(gamelog_store)
+similarity_index = SimilarityIndex(gamelog_store, SIMILARITY_DIR, window=SIMILARITY_WINDOW)
+live_hub = LiveHub(
+    lambda key, params: _live_payload(key, params), interval=LIVE_POLL_SECONDS, idle_seconds=LIVE_IDLE_SECONDS
+)
 
-app = FastAPI(title="NBA Viz API", version="0.2.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if WARMUP_ENABLED:
+        _start_warmup_scheduler()
+    yield
+    _warmup_stop.set()
+    await live_hub.close()
+    if _http_client is not None:
+        await _http_client.aclose()
+
+
+app = FastAPI(title="NBA Viz API", version="0.2.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,19 +127,546 @@ app.add_middleware(
 
 if HEADSHOT_DIR.exists():
     app.mount("/headshots", StaticFiles(directory=str(HEADSHOT_DIR)), name="headshots")
+if HEADSHOT_ASSET_DIR.exists():
+    app.mount("/headshot-assets", StaticFiles(directory=str(HEADSHOT_ASSET_DIR)), name="headshot-assets")
 if TEAM_LOGO_DIR.exists():
     app.mount("/team-logos", StaticFiles(directory=str(TEAM_LOGO_DIR)), name="team-logos")
 
 TECHNICAL_PARAM_NAMES = {"proxy", "headers", "timeout", "get_request"}
 
 
-def _cached_call(cache_key: str, fn):
-    cached = cache.get(cache_key)
+class _RateBudget:
+    # Spacing between upstream NBA requests, shared by user requests and warmup. The next free
+    # slot lives in the cache directory so every worker process draws from the same budget.
+    slot_key = "meta::upstream_next_slot"
+
+    def __init__(self, min_interval: float, shared: Cache):
+        self.min_interval = max(0.0, min_interval)
+        self.calls = 0
+        self._shared = shared
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock, self._shared.transact():
+            now = time.time()
+            slot = max(now, float(self._shared.get(self.slot_key, 0.0)))
+            self._shared.set(self.slot_key, slot + self.min_interval, expire=3600)
+            self.calls += 1
+            return slot - now
+
+
+upstream_budget = _RateBudget(UPSTREAM_MIN_INTERVAL_SECONDS, cache)
+_upstream_calls: ContextVar[list[int] | None] = ContextVar("upstream_calls", default=None)
+_http_client: httpx.AsyncClient | None = None
+
+
+def _client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=UPSTREAM_MAX_CONNECTIONS),
+        )
+    return _http_client
+
+
+async def _upstream_call(fn):
+    wait = await run_in_threadpool(upstream_budget.reserve)
+    if wait > 0:
+        await asyncio.sleep(wait)
+    counter = _upstream_calls.get()
+    if counter is not None:
+        counter[0] += 1
+    return await fn()
+
+
+async def _fetch_endpoint(endpoint_cls: Any, kwargs: dict[str, Any], domain: str):
+    # Build the nba_api endpoint without its blocking requests call, fetch the same URL with
+    # the shared async client, then let the endpoint parse the response as usual.
+    endpoint = endpoint_cls(**kwargs, get_request=False)
+    if domain == "stats":
+        http_cls = NBAStatsHTTP
+        path = endpoint.endpoint
+        params = [(k, str(v)) for k, v in sorted(endpoint.parameters.items()) if v is not None]
+    else:
+        http_cls = NBALiveHTTP
+        path = endpoint.endpoint_url.format(game_id=getattr(endpoint, "game_id", ""))
+        params = []
+
+    headers = {k: v for k, v in http_cls.headers.items() if k.lower() != "accept-encoding"}
+    response = await _client().get(
+        http_cls.base_url.format(endpoint=path),
+        params=params,
+        headers=headers,
+        timeout=kwargs.get("timeout", UPSTREAM_TIMEOUT_SECONDS),
+    )
+    if response.status_code == 429 or response.status_code >= 500:
+        response.raise_for_status()
+
+    endpoint.nba_response = http_cls.nba_response(
+        response=http_cls().clean_contents(response.text),
+        status_code=response.status_code,
+        url=str(response.url),
+    )
+    await run_in_threadpool(endpoint.load_response)
+    return endpoint
+
+
+NEGATIVE_TTLS = {"nodata": NEGATIVE_NODATA_TTL_SECONDS, "error": NEGATIVE_ERROR_TTL_SECONDS}
+
+_circuit_lock = threading.Lock()
+_circuits: dict[str, dict[str, Any]] = {}
+
+
+def _classify_upstream_error(exc: Exception) -> str:
+    # Unparseable responses are how stats.nba.com rejects parameters or has nothing for them;
+    # network-level failures and 429/5xx statuses are worth retrying soon.
+    if isinstance(exc, (ValueError, KeyError, IndexError, TypeError)):
+        return "nodata"
+    return "error"
+
+
+def _record_negative(cache_key: str, kind: str, status_code: int, detail: str) -> None:
+    cache.set(
+        f"neg::{kind}::{cache_key}",
+        {"status_code": status_code, "detail": detail},
+        expire=NEGATIVE_TTLS[kind],
+        tag=time.time(),
+    )
+
+
+def _raise_if_negative(cache_key: str) -> None:
+    for kind in NEGATIVE_TTLS:
+        negative = cache.get(f"neg::{kind}::{cache_key}")
+        if negative is not None:
+            raise HTTPException(status_code=negative["status_code"], detail=negative["detail"])
+
+
+def _circuit_allows(endpoint_key: str) -> bool:
+    with _circuit_lock:
+        state = _circuits.get(endpoint_key)
+        if state is None or state["opened_at"] is None:
+            return True
+        if time.monotonic() - state["opened_at"] >= CIRCUIT_COOLDOWN_SECONDS and not state["probing"]:
+            # Half-open: let exactly one request through to test the endpoint.
+            state["probing"] = True
+            return True
+        return False
+
+
+def _circuit_result(endpoint_key: str, ok: bool) -> None:
+    with _circuit_lock:
+        if ok:
+            _circuits.pop(endpoint_key, None)
+            return
+        state = _circuits.setdefault(endpoint_key, {"failures": 0, "opened_at": None, "probing": False})
+        state["failures"] += 1
+        if state["probing"] or state["failures"] >= CIRCUIT_FAILURE_THRESHOLD:
+            state["opened_at"] = time.monotonic()
+            state["probing"] = False
+
+
+def _open_circuits() -> list[dict[str, Any]]:
+    now = time.monotonic()
+    with _circuit_lock:
+        return [
+            {
+                "endpoint": key,
+                "failures": state["failures"],
+                "retry_in_seconds": round(max(0.0, CIRCUIT_COOLDOWN_SECONDS - (now - state["opened_at"])), 1),
+            }
+            for key, state in _circuits.items()
+            if state["opened_at"] is not None
+        ]
+
+
+async def _guarded_upstream(endpoint_key: str, cache_key: str, fn):
+    _raise_if_negative(cache_key)
+    if not _circuit_allows(endpoint_key):
+        raise HTTPException(
+            status_code=503,
+            detail=f"NBA API endpoint '{endpoint_key}' is failing repeatedly; circuit is open",
+        )
+    try:
+        result = await _upstream_call(fn)
+    except Exception as exc:
+        kind = _classify_upstream_error(exc)
+        detail = f"NBA API request failed for endpoint '{endpoint_key}': {exc}"
+        _record_negative(cache_key, kind, 502, detail)
+        _circuit_result(endpoint_key, kind != "error")
+        raise HTTPException(status_code=502, detail=detail) from exc
+    _circuit_result(endpoint_key, True)
+    return result
+
+
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def _acquire_fill_lock(lock_key: str, token: str) -> bool:
+    return cache.add(lock_key, token, expire=FILL_LOCK_SECONDS, tag=time.time())
+
+
+def _release_fill_lock(lock_key: str, token: str) -> None:
+    with cache.transact():
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def _touch_fill_lock(lock_key: str, token: str) -> bool:
+    with cache.transact():
+        return cache.get(lock_key) == token and cache.touch(lock_key, expire=FILL_LOCK_SECONDS)
+
+
+async def _renew_fill_lock(lock_key: str, token: str) -> None:
+    # Day-by-day tracking fills and warmups run for minutes, far longer than FILL_LOCK_SECONDS.
+    while await run_in_threadpool(_touch_fill_lock, lock_key, token):
+        await asyncio.sleep(FILL_LOCK_SECONDS / 3)
+
+
+async def _single_flight(cache_key: str, lookup, fill):
+    # One fill per key: concurrent requests in this process share a future, and other worker
+    # processes wait on a lock entry in the shared cache until the value appears.
+    pending = _inflight.get(cache_key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    lock_key = f"lock::{cache_key}"
+    token = f"{os.getpid()}:{id(future)}"
+    try:
+        # The holder renews the lock while it fills, so it only lapses if that worker died.
+        # Lock and lookup hit SQLite and can block while other workers write, so they run in
+        # the threadpool rather than on the event loop.
+        while not await run_in_threadpool(_acquire_fill_lock, lock_key, token):
+            await asyncio.sleep(0.05)
+            value = await run_in_threadpool(lookup)
+            if value is not None:
+                future.set_result(value)
+                return value
+        renewal = asyncio.create_task(_renew_fill_lock(lock_key, token))
+        try:
+            result = await fill()
+        finally:
+            renewal.cancel()
+            await run_in_threadpool(_release_fill_lock, lock_key, token)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        if not future.done():
+            future.set_exception(exc)
+            future.exception()
+        raise
+    finally:
+        _inflight.pop(cache_key, None)
+
+
+async def _cached_call(cache_key: str, fn):
+    cached = tiers.get(cache_key)
     if cached is not None:
         return cached
-    result = fn()
-    cache.set(cache_key, result, expire=CACHE_TTL_SECONDS)
-    return result
+
+    async def fill():
+        result = await fn()
+        tiers.set(cache_key, result, expire=CACHE_TTL_SECONDS)
+        return result
+
+    return await _single_flight(cache_key, lambda: tiers.get(cache_key), fill)
+
+
+def _content_digest(content: Any) -> str:
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _store_blob(content: Any, ttl: int = CACHE_TTL_SECONDS) -> str:
+    digest = _content_digest(content)
+    blob_key = f"blob::{digest}"
+    # Identical payloads from different queries share one stored blob. The blob lives as long as
+    # the longest-lived ref to it: re-storing extends it but never shortens it.
+    with cache.transact():
+        value, expire_at = cache.get(blob_key, read=True, expire_time=True)
+        if hasattr(value, "close"):
+            value.close()
+        if value is None:
+            cache.set(blob_key, compact_content(content), expire=ttl, tag=time.time())
+        elif expire_at is not None and expire_at < time.time() + ttl:
+            cache.touch(blob_key, expire=ttl)
+    return digest
+
+
+def _lookup_content(cache_key: str) -> dict[str, Any] | None:
+    ref = tiers.get(cache_key)
+    if ref is None:
+        return None
+    content = tiers.get(f"blob::{ref['blob']}")
+    if content is None:
+        return None
+    return {**ref["envelope"], **expand_content(content)}
+
+
+async def _cached_content_call(cache_key: str, fn, content_fields: tuple[str, ...], ttl: int = CACHE_TTL_SECONDS):
+    cached = _lookup_content(cache_key)
+    if cached is not None:
+        return cached
+
+    async def fill():
+        result = await fn()
+        content = {k: result[k] for k in content_fields}
+        envelope = {k: v for k, v in result.items() if k not in content_fields}
+        digest = await run_in_threadpool(_store_blob, content, ttl)
+        tiers.set(cache_key, {"envelope": envelope, "blob": digest}, expire=ttl)
+        return result
+
+    return await _single_flight(cache_key, lambda: _lookup_content(cache_key), fill)
+
+
+def _encode_json(data: Any) -> bytes:
+    # orjson writes NaN/inf as null, which is what browsers can parse anyway.
+    return orjson.dumps(
+        data,
+        default=str,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+def _serialized_entry(data: Any) -> dict[str, Any]:
+    body = _encode_json(data)
+    entry: dict[str, Any] = {
+        "etag": f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+        "identity": body,
+    }
+    if len(body) >= COMPRESS_MIN_BYTES:
+        entry["gzip"] = gzip.compress(body, compresslevel=6)
+        if brotli is not None:
+            entry["br"] = brotli.compress(body, quality=5)
+    return entry
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    out: set[str] = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        if name:
+            out.add(name.strip().lower())
+    return out
+
+
+def _entry_response(request: Request, entry: dict[str, Any]) -> Response:
+    headers = {"ETag": entry["etag"], "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match and (
+        if_none_match.strip() == "*" or entry["etag"] in [x.strip() for x in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=headers)
+
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and encoding in entry:
+            headers["Content-Encoding"] = encoding
+            return Response(content=entry[encoding], media_type="application/json", headers=headers)
+    return Response(content=entry["identity"], media_type="application/json", headers=headers)
+
+
+async def _cached_entry(cache_key: str, build, ttl=CACHE_TTL_SECONDS) -> dict[str, Any]:
+    # Final response bytes (plus gzip/br variants) are cached, so hits skip unpickling the
+    # Python payload and re-encoding it on every request. Warmup fills the same entries.
+    resp_key = f"resp::{cache_key}"
+    entry = tiers.get(resp_key)
+    if entry is None:
+
+        async def fill():
+            data = await build()
+            built = await run_in_threadpool(_serialized_entry, data)
+            tiers.set(resp_key, built, expire=ttl(data) if callable(ttl) else ttl)
+            return built
+
+        entry = await _single_flight(resp_key, lambda: tiers.get(resp_key), fill)
+    return entry
+
+
+async def _cached_response(request: Request, cache_key: str, build, ttl=CACHE_TTL_SECONDS) -> Response:
+    return _entry_response(request, await _cached_entry(cache_key, build, ttl))
+
+
+CACHE_AGE_BUCKETS = [
+    ("<1m", 60),
+    ("<10m", 600),
+    ("<1h", 3600),
+    ("<6h", 21600),
+    ("<1d", 86400),
+]
+
+
+def _describe_cache_key(key: str) -> dict[str, Any]:
+    if key.startswith(("neg::nodata::", "neg::error::")):
+        _, kind, inner = key.split("::", 2)
+        return {**_describe_cache_key(inner), "family": f"neg::{kind}"}
+    if key.startswith("resp::"):
+        inner = _describe_cache_key(key[len("resp::"):])
+        return {**inner, "family": f"resp::{inner['family']}"}
+
+    info: dict[str, Any] = {"family": key.split("::", 1)[0], "endpoint": None, "params": {}}
+    if key.startswith(("query::stats::", "query::live::")):
+        domain_prefix, _, rest = key.partition("::")[2].partition("::")
+        info["family"] = f"query::{domain_prefix}"
+        head, sep, params_json = rest.partition("::{")
+        if sep:
+            try:
+                info["params"] = json.loads("{" + params_json)
+            except ValueError:
+                pass
+        info["endpoint"] = head if domain_prefix == "live" else head.split("::", 1)[0]
+    elif key.startswith("players::"):
+        info["params"] = {"season": key.split("::", 1)[1]}
+    elif key.startswith(("trends::", "yoy::", "gamelogs::")):
+        head, sep, params_json = key.partition("::{")
+        info["endpoint"] = head.split("::", 1)[1]
+        if sep:
+            try:
+                info["params"] = json.loads("{" + params_json)
+            except ValueError:
+                pass
+    return info
+
+
+def _stats_key_season(info: dict[str, Any], key: str) -> str | None:
+    # Stats cache keys drop a season equal to the endpoint default (the current season), so
+    # the season such a key is for comes from the endpoint signature, as in _request_season.
+    # Also reached through the resp:: and neg:: entries wrapping a stats key.
+    if "query::stats::" not in key or not info["endpoint"]:
+        return None
+    try:
+        _, endpoint_cls = _resolve_endpoint(info["endpoint"])
+    except (HTTPException, ImportError):
+        return None
+    return _request_season(endpoint_cls, info["params"])
+
+
+def _key_matches(
+    info: dict[str, Any],
+    key: str,
+    prefix: str | None,
+    endpoint: str | None,
+    season: str | None,
+    player_id: int | None,
+) -> bool:
+    if prefix and not key.startswith(prefix):
+        return False
+    if endpoint and info["endpoint"] != endpoint:
+        return False
+    params = info["params"]
+    if season and not (
+        any(str(params.get(name)) == season for name in ("season", "season_nullable", "season_year"))
+        or season in (params.get("seasons") or [])
+        or _stats_key_season(info, key) == season
+    ):
+        return False
+    if player_id is not None:
+        player_values = [v for name, v in params.items() if "player_id" in name or name == "person_id"]
+        if not any(str(v) == str(player_id) for v in player_values):
+            return False
+    return True
+
+
+def _collect_orphan_blobs() -> int:
+    # Any entry outside the blob namespace may hold a {"blob": digest} ref (query::, resp::, ...).
+    referenced: set[str] = set()
+    blob_keys: list[str] = []
+    for key in list(cache.iterkeys()):
+        if not isinstance(key, str):
+            continue
+        if key.startswith("blob::"):
+            blob_keys.append(key)
+            continue
+        ref = cache.get(key, read=True)
+        if isinstance(ref, dict) and isinstance(ref.get("blob"), str):
+            referenced.add(f"blob::{ref['blob']}")
+        elif hasattr(ref, "close"):
+            ref.close()
+    removed = 0
+    for key in blob_keys:
+        if key not in referenced and cache.delete(key):
+            removed += 1
+    return removed
+
+
+def _invalidate_cache(
+    prefix: str | None = None,
+    endpoint: str | None = None,
+    season: str | None = None,
+    player_id: int | None = None,
+) -> dict[str, Any]:
+    removed: dict[str, int] = {}
+    for key in list(cache.iterkeys()):
+        if not isinstance(key, str) or key.startswith("blob::"):
+            continue
+        info = _describe_cache_key(key)
+        if not _key_matches(info, key, prefix, endpoint, season, player_id):
+            continue
+        if cache.delete(key):
+            removed[info["family"]] = removed.get(info["family"], 0) + 1
+    tiers.invalidate()
+    return {
+        "removed": sum(removed.values()),
+        "removed_by_family": removed,
+        "orphan_blobs_removed": _collect_orphan_blobs(),
+    }
+
+
+def _cache_entry_size(value: Any) -> int:
+    # Large values come back as an open file (read=True) instead of being loaded.
+    if hasattr(value, "fileno"):
+        with value:
+            return os.fstat(value.fileno()).st_size
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _cache_stats() -> dict[str, Any]:
+    # Every writer tags its entry with the store time, so ages come from the public get() API.
+    now = time.time()
+    families: dict[str, dict[str, Any]] = {}
+    for key in list(cache.iterkeys()):
+        value, store_time = cache.get(key, read=True, tag=True)
+        if value is None:
+            continue
+        size = _cache_entry_size(value)
+        family = _describe_cache_key(key)["family"] if isinstance(key, str) else "other"
+        entry = families.setdefault(
+            family,
+            {
+                "entries": 0,
+                "bytes": 0,
+                "oldest_seconds": 0,
+                "newest_seconds": None,
+                "age_buckets": {label: 0 for label, _ in CACHE_AGE_BUCKETS} | {">=1d": 0},
+            },
+        )
+        age = max(0.0, now - (store_time if isinstance(store_time, (int, float)) else now))
+        entry["entries"] += 1
+        entry["bytes"] += int(size or 0)
+        entry["oldest_seconds"] = max(entry["oldest_seconds"], round(age))
+        if entry["newest_seconds"] is None or age < entry["newest_seconds"]:
+            entry["newest_seconds"] = round(age)
+        bucket = next((label for label, limit in CACHE_AGE_BUCKETS if age < limit), ">=1d")
+        entry["age_buckets"][bucket] += 1
+
+    return {
+        "entries": sum(x["entries"] for x in families.values()),
+        "bytes": sum(x["bytes"] for x in families.values()),
+        "volume_bytes": cache.volume(),
+        "ttl_seconds": CACHE_TTL_SECONDS,
+        "worker_pid": os.getpid(),
+        "warm_tier": tiers.describe(),
+        "families": dict(sorted(families.items(), key=lambda item: item[1]["bytes"], reverse=True)),
+    }
 
 
 def _headshot_index() -> dict[int, str]:
@@ -71,7 +683,7 @@ def _headshot_index() -> dict[int, str]:
             if m:
                 mapping[int(m.group(1))] = f"/headshots/{file.name}"
 
-    cache.set(cache_key, mapping, expire=CACHE_TTL_SECONDS)
+    cache.set(cache_key, mapping, expire=CACHE_TTL_SECONDS, tag=time.time())
     return mapping
 
 
@@ -84,6 +696,60 @@ def _resolve_headshot_url(player_id: int, local_map: dict[int, str] | None = Non
     return shots.get(int(player_id)) or _cdn_headshot_url(int(player_id))
 
 
+def _headshot_atlas() -> dict[str, Any]:
+    # atlas.json written by scripts/build_headshot_assets.py, keyed by its mtime so a rebuild is
+    # picked up without waiting for the cache TTL.
+    path = HEADSHOT_ASSET_DIR / "atlas.json"
+    try:
+        cache_key = f"headshot_atlas_v1::{path.stat().st_mtime_ns}"
+    except OSError:
+        return {}
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    slots: dict[int, list[tuple[str, int]]] = {}
+    # Newest season first, so a player without a season hint resolves to their latest atlas.
+    for name in sorted(raw.get("atlases", {}), reverse=True):
+        for index, pid in enumerate(raw["atlases"][name].get("players", [])):
+            slots.setdefault(int(pid), []).append((name, index))
+    mapping = {"group": raw.get("group"), "atlases": raw.get("atlases", {}), "players": slots}
+    cache.set(cache_key, mapping, expire=CACHE_TTL_SECONDS, tag=time.time())
+    return mapping
+
+
+def _resolve_headshot_sprite(
+    player_id: int,
+    group: str | None = None,
+    size: int = HEADSHOT_SPRITE_SIZE,
+    atlas: dict[str, Any] | None = None,
+) -> dict[str, Any] | None:
+    atlas = atlas if atlas is not None else _headshot_atlas()
+    slots = atlas.get("players", {}).get(int(player_id))
+    if not slots:
+        return None
+    name, index = next((slot for slot in slots if slot[0] == group), slots[0])
+    entry = atlas["atlases"][name]
+    image = entry.get("images", {}).get(str(size))
+    if image is None:
+        return None
+    columns = int(entry["columns"][str(size)])
+    return {
+        "url": f"/headshot-assets/{image['path']}",
+        "atlas": name,
+        "x": (index % columns) * image["cell_width"],
+        "y": (index // columns) * image["cell_height"],
+        "width": image["cell_width"],
+        "height": image["cell_height"],
+        "atlas_width": image["width"],
+        "atlas_height": image["height"],
+    }
+
+
 def _parse_float(value: Any) -> float | None:
     if value is None:
         return None
@@ -158,14 +824,17 @@ def _player_name_from_row(row: dict[str, Any]) -> str | None:
     return None
 
 
-def _attach_headshots(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _attach_headshots(rows: list[dict[str, Any]], season: str | None = None) -> list[dict[str, Any]]:
     shots = _headshot_index()
+    atlas = _headshot_atlas()
     out: list[dict[str, Any]] = []
     for rec in rows:
         row = dict(rec)
         pid = _player_id_from_row(row)
         if pid is not None:
             row["headshot_url"] = _resolve_headshot_url(pid, shots)
+            if atlas:
+                row["headshot_sprite"] = _resolve_headshot_sprite(pid, season, atlas=atlas)
         out.append(row)
     return out
 
@@ -416,7 +1085,7 @@ def _endpoint_registry() -> dict[str, dict[str, Any]]:
             "params": _parameter_schema(cls),
         }
 
-    cache.set(key, registry, expire=CACHE_TTL_SECONDS)
+    cache.set(key, registry, expire=CACHE_TTL_SECONDS, tag=time.time())
     return registry
 
 
@@ -471,6 +1140,35 @@ def _filter_params(endpoint_cls: Any, params: dict[str, Any]) -> dict[str, Any]:
     return out
 
 
+def _canonical_params(endpoint_cls: Any, params: dict[str, Any]) -> dict[str, Any]:
+    # Explicitly passed defaults are dropped so they share cache entries with omitted ones.
+    sig = inspect.signature(endpoint_cls.__init__)
+    out: dict[str, Any] = {}
+    for name, value in _filter_params(endpoint_cls, params).items():
+        default = sig.parameters[name].default
+        if default is not inspect._empty and str(value) == str(default):
+            continue
+        out[name] = value
+    return out
+
+
+def _request_season(endpoint_cls: Any, params: dict[str, Any]) -> str | None:
+    # The season a request is for, before _canonical_params drops it for matching the default.
+    sig = inspect.signature(endpoint_cls.__init__)
+    filtered = _filter_params(endpoint_cls, params)
+    for name in ("season", "season_nullable", "season_year"):
+        value = filtered.get(name)
+        if value in (None, "") and name in sig.parameters:
+            value = sig.parameters[name].default
+        if value not in (None, "", inspect._empty):
+            return str(value)
+    return None
+
+
+def _params_key(params: dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
 def _resolve_endpoint(key: str) -> tuple[dict[str, Any], Any]:
     registry = _endpoint_registry()
     info = registry.get(key)
@@ -481,31 +1179,39 @@ def _resolve_endpoint(key: str) -> tuple[dict[str, Any], Any]:
     return info, cls
 
 
-def _query_stats_endpoint(key: str, params: dict[str, Any], dataset_index: int, max_rows: int):
+def _stats_cache_key(key: str, canonical: dict[str, Any], dataset_index: int, max_rows: int) -> str:
+    return f"query::stats::{key}::{dataset_index}::{max_rows}::{_params_key(canonical)}"
+
+
+def _live_cache_key(key: str, canonical: dict[str, Any]) -> str:
+    return f"query::live::{key}::{_params_key(canonical)}"
+
+
+async def _query_stats_endpoint(key: str, params: dict[str, Any], dataset_index: int, max_rows: int):
     info, endpoint_cls = _resolve_endpoint(key)
-    filtered = _filter_params(endpoint_cls, params)
-    filtered["timeout"] = 30
+    canonical = _canonical_params(endpoint_cls, params)
+    filtered = {**canonical, "timeout": 30}
+    season = _request_season(endpoint_cls, params)
 
-    cache_key = f"query::stats::{key}::{dataset_index}::{max_rows}::{repr(sorted(filtered.items()))}"
+    cache_key = _stats_cache_key(key, canonical, dataset_index, max_rows)
 
-    def load():
-        try:
-            endpoint = endpoint_cls(**filtered)
-            frames = endpoint.get_data_frames()
-        except Exception as exc:
-            raise HTTPException(
-                status_code=502,
-                detail=f"NBA API request failed for endpoint '{key}': {exc}",
-            ) from exc
+    async def load():
+        endpoint = await _guarded_upstream(
+            key, cache_key, lambda: _fetch_endpoint(endpoint_cls, filtered, "stats")
+        )
+        frames = await run_in_threadpool(endpoint.get_data_frames)
         if not frames:
+            _record_negative(cache_key, "nodata", 502, "No data returned from NBA API")
             raise HTTPException(status_code=502, detail="No data returned from NBA API")
+        return await run_in_threadpool(shape, frames)
 
+    def shape(frames):
         idx = max(0, min(int(dataset_index), len(frames) - 1))
         frame = frames[idx]
         rows = frame.to_dict(orient="records")
         if key == "synergyplaytypes":
             rows = _coalesce_synergy_playtypes(rows)
-        rows = _attach_headshots(rows)
+        rows = _attach_headshots(rows, season)
         rows = rows[: max_rows if max_rows > 0 else len(rows)]
 
         numeric_fields = [
@@ -524,18 +1230,20 @@ def _query_stats_endpoint(key: str, params: dict[str, Any], dataset_index: int,
             "rows": rows,
         }
 
-    return _cached_call(cache_key, load)
+    return await _cached_content_call(cache_key, load, ("columns", "numeric_fields", "rows"))
 
 
-def _query_live_endpoint(key: str, params: dict[str, Any]):
+async def _query_live_endpoint(key: str, params: dict[str, Any]):
     info, endpoint_cls = _resolve_endpoint(key)
-    filtered = _filter_params(endpoint_cls, params)
-    filtered["timeout"] = 30
+    canonical = _canonical_params(endpoint_cls, params)
+    filtered = {**canonical, "timeout": 30}
 
-    cache_key = f"query::live::{key}::{repr(sorted(filtered.items()))}"
+    cache_key = _live_cache_key(key, canonical)
 
-    def load():
-        endpoint = endpoint_cls(**filtered)
+    async def load():
+        endpoint = await _guarded_upstream(
+            key, cache_key, lambda: _fetch_endpoint(endpoint_cls, filtered, "live")
+        )
         payload = endpoint.get_dict()
         return {
             "endpoint": key,
@@ -544,7 +1252,12 @@ def _query_live_endpoint(key: str, params: dict[str, Any]):
             "payload": payload,
         }
 
-    return _cached_call(cache_key, load)
+    # Live data goes stale within seconds, so it never sits in the cache for the stats TTL.
+    return await _cached_content_call(cache_key, load, ("payload",), ttl=LIVE_TTL_SECONDS)
+
+
+async def _live_payload(key: str, params: dict[str, Any]) -> Any:
+    return (await _query_live_endpoint(key, params))["payload"]
 
 
 def _inject_season(params: dict[str, Any], season: str):
@@ -626,16 +1339,21 @@ def _trends_numeric_fields(rows: list[dict[str, Any]]) -> list[str]:
     return out
 
 
-def _tracking_row_for_player(game_id: str, player_id: int) -> dict[str, Any] | None:
+async def _tracking_row_for_player(game_id: str, player_id: int) -> dict[str, Any] | None:
     cache_key = f"tracking_game_map::{game_id}"
     cached_map = cache.get(cache_key)
     if cached_map is None:
         try:
-            endpoint = boxscoreplayertrackv3.BoxScorePlayerTrackV3(game_id=game_id, timeout=30)
-            frames = endpoint.get_data_frames()
-        except Exception:
-            cache.set(cache_key, {}, expire=CACHE_TTL_SECONDS)
+            endpoint = await _guarded_upstream(
+                "boxscoreplayertrackv3",
+                cache_key,
+                lambda: _fetch_endpoint(
+                    boxscoreplayertrackv3.BoxScorePlayerTrackV3, {"game_id": game_id, "timeout": 30}, "stats"
+                ),
+            )
+        except HTTPException:
             return None
+        frames = await run_in_threadpool(endpoint.get_data_frames)
 
         game_map: dict[int, dict[str, Any]] = {}
         for frame in frames:
@@ -646,7 +1364,7 @@ def _tracking_row_for_player(game_id: str, player_id: int) -> dict[str, Any] | N
                 except (TypeError, ValueError):
                     continue
                 game_map[pid_int] = row
-        cache.set(cache_key, game_map, expire=CACHE_TTL_SECONDS)
+        cache.set(cache_key, game_map, expire=CACHE_TTL_SECONDS, tag=time.time())
         cached_map = game_map
 
     return cached_map.get(int(player_id))
@@ -676,35 +1394,260 @@ def _iter_dates(start: datetime, end: datetime):
         cursor += timedelta(days=1)
 
 
+async def _player_gamelog_result(player_id: int, season: str, season_type: str) -> dict[str, Any]:
+    return await _query_stats_endpoint(
+        key="playergamelogs",
+        params={
+            "player_id_nullable": player_id,
+            "season_nullable": season,
+            "season_type_nullable": season_type,
+        },
+        dataset_index=0,
+        max_rows=500,
+    )
+
+
+async def _player_game_rows(player_id: int, season: str, season_type: str) -> list[dict[str, Any]]:
+    try:
+        return await run_in_threadpool(gamelog_store.player_rows, player_id, season, season_type)
+    except Exception as exc:
+        print(f"[store] local gamelog lookup failed, using upstream: {exc}", flush=True)
+        return []
+
+
+async def _warehouse_tracking_rows(
+    season: str, season_type: str, tracking_measure: str, player_id: int
+) -> tuple[list[dict[str, Any]], set[str]] | None:
+    try:
+        return await run_in_threadpool(
+            tracking_warehouse.player_rows, season, season_type, tracking_measure, player_id
+        )
+    except Exception as exc:
+        print(f"[store] tracking warehouse lookup failed, using upstream: {exc}", flush=True)
+        return None
+
+
+async def _tracking_day_result(season: str, season_type: str, tracking_measure: str, date_str: str) -> dict[str, Any]:
+    return await _query_stats_endpoint(
+        key="leaguedashptstats",
+        params={
+            "season": season,
+            "season_type_all_star": season_type,
+            "per_mode_simple": "PerGame",
+            "player_or_team": "Player",
+            "pt_measure_type": tracking_measure,
+            "date_from_nullable": date_str,
+            "date_to_nullable": date_str,
+        },
+        dataset_index=0,
+        max_rows=4000,
+    )
+
+
+async def _top_minutes_player_ids(season: str, season_type: str, limit: int) -> list[int]:
+    result = await _query_stats_endpoint(
+        key="leaguedashplayerstats",
+        params={
+            "season": season,
+            "season_type_all_star": season_type,
+            "per_mode_detailed": "Totals",
+        },
+        dataset_index=0,
+        max_rows=4000,
+    )
+    ranked = sorted(result["rows"], key=lambda r: _safe_number(r.get("MIN")), reverse=True)
+    out: list[int] = []
+    for row in ranked:
+        pid = _player_id_from_row(row)
+        if pid is not None and pid not in out:
+            out.append(pid)
+        if len(out) >= limit:
+            break
+    return out
+
+
+_warmup_lock = asyncio.Lock()
+_warmup_stop = asyncio.Event()
+_warmup_tasks_running: set[asyncio.Task] = set()
+_warmup_state: dict[str, Any] = {"running": False, "last_run": None, "next_run": None}
+
+
+def _warmup_tasks() -> list[tuple[str, Any]]:
+    season = DEFAULT_SEASON
+    season_type = WARMUP_SEASON_TYPE
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    # Players and top-player trends are warmed through the same response entries the routes
+    # serve; tracking days only prime the upstream day cache those responses are built from.
+    tasks: list[tuple[str, Any]] = [
+        (f"players::{season}", lambda: _players_entry(season)),
+    ]
+    if WARMUP_TOP_PLAYERS > 0:
+        tasks.append(
+            (
+                f"top_minutes::{season}::{season_type}",
+                lambda: _top_minutes_player_ids(season, season_type, WARMUP_TOP_PLAYERS),
+            )
+        )
+    for measure in WARMUP_TRACKING_MEASURES:
+        tasks.append(
+            (
+                f"tracking::{season}::{season_type}::{measure}::{yesterday}",
+                lambda measure=measure: _tracking_day_result(season, season_type, measure, yesterday),
+            )
+        )
+    return tasks
+
+
+async def _run_warmup_task(name: str, fn) -> tuple[dict[str, Any], Any]:
+    started = time.perf_counter()
+    counter = [0]
+    token = _upstream_calls.set(counter)
+    item: dict[str, Any] = {"name": name, "ok": True}
+    result = None
+    try:
+        result = await fn()
+    except Exception as exc:
+        item["ok"] = False
+        item["error"] = str(getattr(exc, "detail", exc))
+    finally:
+        _upstream_calls.reset(token)
+    item["seconds"] = round(time.perf_counter() - started, 3)
+    item["upstream_calls"] = counter[0]
+    return item, result
+
+
+async def _run_warmup(trigger: str) -> dict[str, Any] | None:
+    if _warmup_lock.locked():
+        return None
+    if trigger in {"startup", "nightly"} and not cache.add(
+        f"lock::warmup::{trigger}", os.getpid(), expire=WARMUP_LOCK_SECONDS, tag=time.time()
+    ):
+        # Another worker process already ran this scheduled warmup.
+        return None
+    async with _warmup_lock:
+        _warmup_state["running"] = True
+        try:
+            started_at = datetime.now()
+            started = time.perf_counter()
+            items: list[dict[str, Any]] = []
+
+            for name, fn in _warmup_tasks():
+                if _warmup_stop.is_set():
+                    break
+                item, result = await _run_warmup_task(name, fn)
+                items.append(item)
+                if name.startswith("top_minutes::") and item["ok"]:
+                    # Gamelogs for the heaviest-minute players are expanded from the ranking task.
+                    for pid in result:
+                        if _warmup_stop.is_set():
+                            break
+                        gamelog_item, _ = await _run_warmup_task(
+                            f"trends::player::{pid}::{DEFAULT_SEASON}::{WARMUP_SEASON_TYPE}",
+                            lambda pid=pid: _trends_player_entry(
+                                pid, "overall", DEFAULT_SEASON, WARMUP_SEASON_TYPE, "Passing"
+                            ),
+                        )
+                        items.append(gamelog_item)
+
+            report = {
+                "trigger": trigger,
+                "started_at": started_at.isoformat(timespec="seconds"),
+                "seconds": round(time.perf_counter() - started, 3),
+                "warmed": len([x for x in items if x["ok"]]),
+                "failed": len([x for x in items if not x["ok"]]),
+                "upstream_calls": sum(x["upstream_calls"] for x in items),
+                "items": items,
+            }
+            _warmup_state["last_run"] = report
+            print(
+                f"[warmup] {trigger}: {report['warmed']} warmed, {report['failed']} failed, "
+                f"{report['upstream_calls']} upstream calls in {report['seconds']}s",
+                flush=True,
+            )
+            return report
+        finally:
+            _warmup_state["running"] = False
+
+
+def _next_warmup_time(now: datetime) -> datetime:
+    target = now.replace(hour=WARMUP_HOUR % 24, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return target
+
+
+async def _warmup_loop() -> None:
+    await _run_warmup("startup")
+    while not _warmup_stop.is_set():
+        next_run = _next_warmup_time(datetime.now())
+        _warmup_state["next_run"] = next_run.isoformat(timespec="seconds")
+        try:
+            await asyncio.wait_for(_warmup_stop.wait(), (next_run - datetime.now()).total_seconds())
+            break
+        except asyncio.TimeoutError:
+            await _run_warmup("nightly")
+
+
+def _spawn_warmup(coro) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _warmup_tasks_running.add(task)
+    task.add_done_callback(_warmup_tasks_running.discard)
+
+
+def _start_warmup_scheduler() -> None:
+    _warmup_stop.clear()
+    _spawn_warmup(_warmup_loop())
+
+
+def _trigger_warmup(trigger: str) -> bool:
+    if _warmup_state["running"]:
+        return False
+    _spawn_warmup(_run_warmup(trigger))
+    return True
+
+
 @app.get("/api/health")
-def health() -> dict[str, Any]:
+async def health() -> dict[str, Any]:
     catalog = _catalog_tree()
     return {
         "ok": True,
         "headshot_dir": str(HEADSHOT_DIR),
         "headshots_detected": len(_headshot_index()),
+        "headshot_atlases": len(_headshot_atlas().get("atlases", {})),
         "default_season": DEFAULT_SEASON,
         "stats_endpoints": catalog["stats_endpoints"],
         "live_endpoints": catalog["live_endpoints"],
+        "open_circuits": _open_circuits(),
+        "gamelog_store": await run_in_threadpool(gamelog_store.describe),
+        "tracking_warehouse": await run_in_threadpool(tracking_warehouse.describe),
+        "trend_scanner": trend_scanner.describe(),
+        "similarity_index": similarity_index.describe(),
+        "live_hub": live_hub.describe(),
     }
 
 
-@app.get("/api/players")
-def players(season: str = Query(DEFAULT_SEASON)) -> dict[str, Any]:
+async def _players_payload(season: str) -> dict[str, Any]:
     key = f"players::{season}"
 
-    def load() -> dict[str, Any]:
-        endpoint = commonallplayers.CommonAllPlayers(
-            is_only_current_season=1,
-            season=season,
-            timeout=30,
+    async def load() -> dict[str, Any]:
+        endpoint = await _guarded_upstream(
+            "commonallplayers",
+            key,
+            lambda: _fetch_endpoint(
+                commonallplayers.CommonAllPlayers,
+                {"is_only_current_season": 1, "season": season, "timeout": 30},
+                "stats",
+            ),
         )
-        frames = endpoint.get_data_frames()
+        frames = await run_in_threadpool(endpoint.get_data_frames)
         if not frames:
+            _record_negative(key, "nodata", 502, "No data returned from NBA API")
             raise HTTPException(status_code=502, detail="No data returned from NBA API")
 
         df = frames[0]
         shots = _headshot_index()
+        atlas = _headshot_atlas()
         records = []
         for row in df.to_dict(orient="records"):
             pid = int(row["PERSON_ID"])
@@ -716,41 +1659,192 @@ def players(season: str = Query(DEFAULT_SEASON)) -> dict[str, Any]:
                     "team": row.get("TEAM_ABBREVIATION"),
                     "is_active": row.get("ROSTERSTATUS") == 1,
                     "headshot_url": _resolve_headshot_url(pid, shots),
+                    "headshot_sprite": _resolve_headshot_sprite(pid, season, atlas=atlas) if atlas else None,
                 }
             )
         return {"season": season, "count": len(records), "players": records}
 
-    return _cached_call(key, load)
+    return await _cached_call(key, load)
+
+
+async def _players_entry(season: str) -> dict[str, Any]:
+    return await _cached_entry(f"players::{season}", lambda: _players_payload(season))
+
+
+@app.get("/api/players")
+async def players(request: Request, season: str = Query(DEFAULT_SEASON)) -> Response:
+    return _entry_response(request, await _players_entry(season))
 
 
 @app.get("/api/catalog")
-def catalog() -> dict[str, Any]:
+async def catalog() -> dict[str, Any]:
     return _catalog_tree()
 
 
 @app.get("/api/trends/player")
-def trends_player(
+async def trends_player(
+    request: Request,
     player_id: int,
     source: str = Query("overall"),
     season: str = Query(DEFAULT_SEASON),
     season_type: str = Query("Regular Season"),
     tracking_measure: str = Query("Passing"),
-) -> dict[str, Any]:
+) -> Response:
     source = source.strip().lower()
     if source not in {"overall", "tracking"}:
         raise HTTPException(status_code=400, detail="source must be 'overall' or 'tracking'")
+    return _entry_response(
+        request, await _trends_player_entry(player_id, source, season, season_type, tracking_measure)
+    )
 
-    base = _query_stats_endpoint(
-        key="playergamelogs",
-        params={
-            "player_id_nullable": player_id,
-            "season_nullable": season,
-            "season_type_nullable": season_type,
-        },
-        dataset_index=0,
-        max_rows=500,
+
+async def _trends_player_entry(
+    player_id: int, source: str, season: str, season_type: str, tracking_measure: str
+) -> dict[str, Any]:
+    # The local stores' versions are part of the key so a nightly refresh is picked up at once.
+    data_version = await run_in_threadpool(_local_data_version, season)
+    params = {
+        "player_id": player_id,
+        "source": source,
+        "season": season,
+        "season_type": season_type,
+        "tracking_measure": tracking_measure if source == "tracking" else None,
+        "data_version": data_version,
+    }
+    return await _cached_entry(
+        f"trends::player::{_params_key(params)}",
+        lambda: _trends_player_payload(player_id, source, season, season_type, tracking_measure),
+        # Day-by-day upstream tracking results can be cut short by the circuit breaker.
+        ttl=lambda data: (
+            NEGATIVE_ERROR_TTL_SECONDS
+            if data["source"] == "tracking" and data["data_source"] != "warehouse"
+            else CACHE_TTL_SECONDS
+        ),
+    )
+
+
+@app.get("/api/trends/scan")
+async def trends_scan(
+    request: Request,
+    season: str = Query(DEFAULT_SEASON),
+    season_type: str = Query("Regular Season"),
+    window: int = Query(5, ge=2, le=30),
+    stats: str = Query("", description="Comma separated stat fields (default: all)"),
+    min_games: int = Query(10, ge=0),
+    sort: str = Query("z"),
+    order: str = Query("rising"),
+    limit: int = Query(50, ge=1, le=500),
+) -> Response:
+    sort = sort.strip().lower()
+    order = order.strip().lower()
+    if sort not in SCAN_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SCAN_SORTS)}")
+    if order not in {"rising", "falling"}:
+        raise HTTPException(status_code=400, detail="order must be 'rising' or 'falling'")
+    selected = sorted({x.strip().upper() for x in stats.split(",") if x.strip()})
+
+    # The frame version changes only when the store ingests a partition of this season type.
+    data_version, _ = await run_in_threadpool(trend_scanner.frame, season, season_type)
+    params = {
+        "season": season,
+        "season_type": season_type,
+        "window": window,
+        "stats": selected,
+        "min_games": min_games,
+        "sort": sort,
+        "order": order,
+        "limit": limit,
+        "data_version": data_version,
+    }
+    return await _cached_response(
+        request,
+        f"trends::scan::{_params_key(params)}",
+        lambda: _trends_scan_payload(season, season_type, window, selected, min_games, sort, order, limit),
+    )
+
+
+async def _trends_scan_payload(
+    season: str,
+    season_type: str,
+    window: int,
+    stats: list[str],
+    min_games: int,
+    sort: str,
+    order: str,
+    limit: int,
+) -> dict[str, Any]:
+    payload = await run_in_threadpool(
+        trend_scanner.scan, season, season_type, window, stats or None, min_games, sort, order == "falling", limit
     )
-    game_rows = sorted(base["rows"], key=lambda r: _parse_game_date(r.get("GAME_DATE")))
+    shots = _headshot_index()
+    atlas = _headshot_atlas()
+    for row in payload["rows"]:
+        row["headshot_url"] = _resolve_headshot_url(int(row["player_id"]), shots)
+        if atlas:
+            row["headshot_sprite"] = _resolve_headshot_sprite(int(row["player_id"]), season, atlas=atlas)
+    return payload
+
+
+@app.get("/api/similar/player")
+async def similar_player(
+    request: Request,
+    player_id: int,
+    season: str = Query(DEFAULT_SEASON),
+    season_type: str = Query("Regular Season"),
+    k: int = Query(10, ge=1, le=50),
+    metric: str = Query("cosine"),
+) -> Response:
+    metric = metric.strip().lower()
+    if metric not in SIMILARITY_METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of {', '.join(SIMILARITY_METRICS)}")
+
+    index = await run_in_threadpool(similarity_index.index, season, season_type)
+    if not index["player_ids"]:
+        raise HTTPException(status_code=404, detail=f"No local gamelogs for {season} {season_type}")
+    params = {
+        "player_id": player_id,
+        "season": season,
+        "season_type": season_type,
+        "k": k,
+        "metric": metric,
+        "version": index["version"],
+    }
+
+    async def build() -> dict[str, Any]:
+        payload = await run_in_threadpool(similarity_index.neighbors, season, season_type, player_id, k, metric)
+        if payload is None:
+            raise HTTPException(
+                status_code=404, detail=f"No recent games for player {player_id} in {season} {season_type}"
+            )
+        shots = _headshot_index()
+        atlas = _headshot_atlas()
+        for item in [payload["player"], *payload["neighbors"]]:
+            item["headshot_url"] = _resolve_headshot_url(int(item["player_id"]), shots)
+            if atlas:
+                item["headshot_sprite"] = _resolve_headshot_sprite(int(item["player_id"]), season, atlas=atlas)
+        return payload
+
+    return await _cached_response(request, f"trends::similar::{_params_key(params)}", build)
+
+
+def _local_data_version(season: str) -> str:
+    return f"{gamelog_store.version()}:{tracking_warehouse.version(season)}"
+
+
+async def _trends_player_payload(
+    player_id: int,
+    source: str,
+    season: str,
+    season_type: str,
+    tracking_measure: str,
+) -> dict[str, Any]:
+    game_rows = await _player_game_rows(player_id, season, season_type)
+    data_source = "local"
+    if not game_rows:
+        base = await _player_gamelog_result(player_id, season, season_type)
+        game_rows = base["rows"]
+        data_source = "upstream"
+    game_rows = sorted(game_rows, key=lambda r: _parse_game_date(r.get("GAME_DATE")))
     shots = _headshot_index()
 
     if source == "overall":
@@ -764,6 +1858,7 @@ def trends_player(
             "source": source,
             "season": season,
             "season_type": season_type,
+            "data_source": data_source,
             "count": len(rows),
             "rows": rows,
             "stat_fields": _trends_numeric_fields(rows),
@@ -772,39 +1867,38 @@ def trends_player(
     game_date_map = {_to_date_key(r.get("GAME_DATE")): r for r in game_rows}
     tracking_rows: list[dict[str, Any]] = []
     range_start, range_end = _season_date_range(season, season_type)
+    selected_days: list[tuple[str, dict[str, Any]]] = []
+
+    # Days the warehouse has not ingested (no backfill yet, a missed nightly run) come from upstream.
+    upstream_dates = [d.strftime("%Y-%m-%d") for d in _iter_dates(range_start, range_end)]
+    warehouse = await _warehouse_tracking_rows(season, season_type, tracking_measure, player_id)
+    if warehouse is not None:
+        warehouse_rows, ingested = warehouse
+        selected_days = [(row.pop("GAME_DATE"), row) for row in warehouse_rows]
+        today = datetime.now().strftime("%Y-%m-%d")
+        upstream_dates = [d for d in upstream_dates if d not in ingested and d <= today]
+        data_source = "warehouse+upstream" if upstream_dates else "warehouse"
+    else:
+        data_source = "upstream"
 
-    for date_obj in _iter_dates(range_start, range_end):
-        date_str = date_obj.strftime("%Y-%m-%d")
+    for date_str in upstream_dates:
         try:
-            day_result = _query_stats_endpoint(
-                key="leaguedashptstats",
-                params={
-                    "season": season,
-                    "season_type_all_star": season_type,
-                    "per_mode_simple": "PerGame",
-                    "player_or_team": "Player",
-                    "pt_measure_type": tracking_measure,
-                    "date_from_nullable": date_str,
-                    "date_to_nullable": date_str,
-                },
-                dataset_index=0,
-                max_rows=4000,
-            )
-        except HTTPException:
+            day_result = await _tracking_day_result(season, season_type, tracking_measure, date_str)
+        except HTTPException as exc:
+            if exc.status_code == 503:
+                break
             continue
 
-        selected = None
         for row in day_result["rows"]:
             try:
                 if int(row.get("PLAYER_ID")) == int(player_id):
-                    selected = row
+                    selected_days.append((date_str, row))
                     break
             except (TypeError, ValueError):
                 continue
+    selected_days.sort(key=lambda day: day[0])
 
-        if not selected:
-            continue
-
+    for date_str, selected in selected_days:
         game_row = game_date_map.get(date_str, {})
         item = {
             "GAME_DATE": date_str,
@@ -822,6 +1916,7 @@ def trends_player(
         "season": season,
         "season_type": season_type,
         "tracking_measure": tracking_measure,
+        "data_source": data_source,
         "count": len(tracking_rows),
         "rows": tracking_rows,
         "stat_fields": _trends_numeric_fields(tracking_rows),
@@ -829,7 +1924,7 @@ def trends_player(
 
 
 @app.post("/api/query")
-def query_endpoint(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
+async def query_endpoint(request: Request, payload: dict[str, Any] = Body(...)) -> Response:
     endpoint_key = str(payload.get("endpoint", "")).strip()
     if not endpoint_key:
         raise HTTPException(status_code=400, detail="Missing endpoint")
@@ -841,14 +1936,103 @@ def query_endpoint(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
     dataset_index = int(payload.get("dataset_index", 0))
     max_rows = int(payload.get("max_rows", 1500))
 
-    info, _ = _resolve_endpoint(endpoint_key)
+    info, endpoint_cls = _resolve_endpoint(endpoint_key)
+    canonical = _canonical_params(endpoint_cls, params)
     if info["domain"] == "stats":
-        return _query_stats_endpoint(endpoint_key, params, dataset_index, max_rows)
-    return _query_live_endpoint(endpoint_key, params)
+        return await _cached_response(
+            request,
+            _stats_cache_key(endpoint_key, canonical, dataset_index, max_rows),
+            lambda: _query_stats_endpoint(endpoint_key, params, dataset_index, max_rows),
+        )
+    return await _cached_response(
+        request,
+        _live_cache_key(endpoint_key, canonical),
+        lambda: _query_live_endpoint(endpoint_key, params),
+        ttl=LIVE_TTL_SECONDS,
+    )
+
+
+@app.get("/api/live/stream")
+async def live_stream(request: Request, endpoint: str) -> StreamingResponse:
+    # Server-Sent Events: a snapshot on connect, then a patch whenever the shared poller sees a
+    # change. Every viewer of a game shares one poller, and pollers in different worker
+    # processes share the short-lived live cache entry, so upstream calls do not grow with viewers.
+    info, endpoint_cls = _resolve_endpoint(endpoint.strip())
+    if info["domain"] != "live":
+        raise HTTPException(status_code=400, detail=f"'{endpoint}' is not a live endpoint")
+    params = {k: v for k, v in request.query_params.items() if k != "endpoint"}
+    canonical = _canonical_params(endpoint_cls, params)
+    topic = _live_cache_key(endpoint.strip(), canonical)
+
+    async def events():
+        queue = live_hub.subscribe(topic, endpoint.strip(), params)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": keepalive\n\n"
+                    continue
+                data = {k: v for k, v in message.items() if k != "event"}
+                yield b"event: " + message["event"].encode() + b"\ndata: " + _encode_json(data) + b"\n\n"
+        finally:
+            live_hub.unsubscribe(topic, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/gamelogs/query")
+async def gamelogs_query(request: Request, payload: dict[str, Any] = Body(...)) -> Response:
+    seasons = payload.get("seasons") or [payload.get("season") or DEFAULT_SEASON]
+    if isinstance(seasons, str):
+        seasons = [x.strip() for x in seasons.split(",") if x.strip()]
+    filters = payload.get("filters") or {}
+    if not isinstance(filters, dict):
+        raise HTTPException(status_code=400, detail="filters must be an object")
+    group_by = payload.get("group_by") or []
+    if isinstance(group_by, str):
+        group_by = [group_by]
+    stats = [str(x).strip().upper() for x in payload.get("stats") or [] if str(x).strip()]
+    counts: dict[str, int] = {}
+    for name, default in (("limit", 50), ("min_games", 0)):
+        try:
+            counts[name] = int(payload.get(name, default))
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=f"{name} must be an integer") from exc
+    params = {
+        "seasons": sorted({str(x) for x in seasons}),
+        "season_type": payload.get("season_type", "Regular Season") or None,
+        "filters": filters,
+        "group_by": [str(x).strip().lower() for x in group_by],
+        "stats": stats,
+        "agg": str(payload.get("agg", "avg")).strip().lower(),
+        "order_by": payload.get("order_by") or None,
+        "descending": str(payload.get("order", "desc")).strip().lower() != "asc",
+        "limit": counts["limit"],
+        "min_games": counts["min_games"],
+    }
+
+    async def build() -> dict[str, Any]:
+        try:
+            return await run_in_threadpool(lambda: gamelog_store.query(**params))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    # Keyed on the store version so a nightly refresh is picked up at once.
+    data_version = await run_in_threadpool(gamelog_store.version)
+    return await _cached_response(
+        request, f"gamelogs::query::{_params_key({**params, 'data_version': data_version})}", build
+    )
 
 
 @app.post("/api/available_seasons")
-def available_seasons(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
+async def available_seasons(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
     endpoint_key = str(payload.get("endpoint", "")).strip()
     if not endpoint_key:
         raise HTTPException(status_code=400, detail="Missing endpoint")
@@ -872,7 +2056,7 @@ def available_seasons(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
         params = dict(params_base)
         _inject_season(params, season)
         try:
-            result = _query_stats_endpoint(
+            result = await _query_stats_endpoint(
                 key=endpoint_key,
                 params=params,
                 dataset_index=dataset_index,
@@ -887,7 +2071,7 @@ def available_seasons(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
 
 
 @app.post("/api/yoy_beeswarm")
-def yoy_beeswarm(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
+async def yoy_beeswarm(request: Request, payload: dict[str, Any] = Body(...)) -> Response:
     endpoint_key = str(payload.get("endpoint", "")).strip()
     metric = str(payload.get("metric", "")).strip()
     seasons = payload.get("seasons") or []
@@ -903,15 +2087,41 @@ def yoy_beeswarm(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
     seasons = [str(s).strip() for s in seasons if str(s).strip()]
     seasons = sorted(set(seasons), key=_season_sort_key)
     highlight_ids = [int(x) for x in highlighted_players[:3]]
+    if not isinstance(base_params, dict):
+        raise HTTPException(status_code=400, detail="params must be an object")
+
+    key_params = {
+        "metric": metric,
+        "seasons": seasons,
+        "params": base_params,
+        "dataset_index": dataset_index,
+        "highlight_player_ids": highlight_ids,
+    }
+    return await _cached_response(
+        request,
+        f"yoy::{endpoint_key}::{_params_key(key_params)}",
+        lambda: _yoy_beeswarm_payload(endpoint_key, metric, seasons, base_params, dataset_index, highlight_ids),
+        ttl=lambda data: NEGATIVE_ERROR_TTL_SECONDS if data["skipped_seasons"] else CACHE_TTL_SECONDS,
+    )
+
 
+async def _yoy_beeswarm_payload(
+    endpoint_key: str,
+    metric: str,
+    seasons: list[str],
+    base_params: dict[str, Any],
+    dataset_index: int,
+    highlight_ids: list[int],
+) -> dict[str, Any]:
     all_points: list[dict[str, Any]] = []
     skipped_seasons: list[str] = []
+    atlas = _headshot_atlas()
 
     for season in seasons:
         params = dict(base_params)
         _inject_season(params, season)
         try:
-            result = _query_stats_endpoint(
+            result = await _query_stats_endpoint(
                 key=endpoint_key,
                 params=params,
                 dataset_index=dataset_index,
@@ -935,6 +2145,8 @@ def yoy_beeswarm(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
                 "value": value,
                 "jitter": _jitter(pid, season),
                 "headshot_url": row.get("headshot_url"),
+                # One sprite atlas per plotted season instead of one image per point.
+                "headshot_sprite": _resolve_headshot_sprite(pid, season, atlas=atlas) if atlas else None,
                 "highlighted": pid in highlight_ids,
             }
             all_points.append(point)
@@ -960,6 +2172,46 @@ def yoy_beeswarm(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
 
 
 @app.post("/api/cache/clear")
-def clear_cache() -> dict[str, Any]:
-    cache.clear()
-    return {"ok": True}
+async def clear_cache(payload: dict[str, Any] | None = Body(None)) -> dict[str, Any]:
+    payload = payload or {}
+    prefix = str(payload.get("prefix") or "").strip() or None
+    endpoint = str(payload.get("endpoint") or "").strip() or None
+    season = str(payload.get("season") or "").strip() or None
+    player_id = payload.get("player_id")
+    if player_id is not None:
+        try:
+            player_id = int(player_id)
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="player_id must be an integer") from exc
+
+    if prefix or endpoint or season or player_id is not None:
+        result = await run_in_threadpool(
+            _invalidate_cache, prefix=prefix, endpoint=endpoint, season=season, player_id=player_id
+        )
+        return {"ok": True, "scope": "targeted", **result, "warmup_started": False}
+
+    await run_in_threadpool(cache.clear)
+    tiers.invalidate()
+    warmup_started = _trigger_warmup("cache_clear") if WARMUP_ENABLED else False
+    return {"ok": True, "scope": "all", "warmup_started": warmup_started}
+
+
+@app.get("/api/cache/stats")
+def cache_stats() -> dict[str, Any]:
+    return _cache_stats()
+
+
+@app.get("/api/warmup")
+async def warmup_status() -> dict[str, Any]:
+    return {
+        "enabled": WARMUP_ENABLED,
+        "running": _warmup_state["running"],
+        "next_run": _warmup_state["next_run"],
+        "upstream_min_interval_seconds": upstream_budget.min_interval,
+        "last_run": _warmup_state["last_run"],
+    }
+
+
+@app.post("/api/warmup/run")
+async def warmup_run() -> dict[str, Any]:
+    return {"ok": True, "started": _trigger_warmup("manual")}
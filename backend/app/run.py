@@ -1,5 +1,15 @@
+import os
+
 import uvicorn
 
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=False)
+    # WEB_CONCURRENCY > 1 starts that many worker processes sharing one cache directory.
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=max(1, workers),
+        reload=False,
+    )
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .gamelog_store import STAT_COLUMNS, GamelogStore
+
+SIMILARITY_METRICS = ("cosine", "euclidean")
+
+
+class SimilarityIndex:
+    # Per season type, every player's mean over their last `window` games for each stat, stored
+    # under `directory` as float32 .npy files plus a JSON sidecar. Lookups memory-map the
+    # z-normalised matrix; after a nightly build only players found in re-ingested sources are
+    # recomputed before the normalisation is redone over the whole matrix.
+
+    def __init__(
+        self,
+        store: GamelogStore,
+        directory: Path,
+        window: int = 10,
+        min_games: int = 5,
+        check_seconds: float = 30.0,
+    ):
+        self.store = store
+        self.directory = directory
+        self.window = max(1, window)
+        self.min_games = max(1, min_games)
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._loaded: dict[tuple[str, str], dict[str, Any]] = {}
+        self.stats = {"full_builds": 0, "incremental_builds": 0, "players_recomputed": 0, "lookups": 0}
+
+    def _paths(self, season: str, season_type: str) -> tuple[Path, Path, Path]:
+        stem = f"{season}_{season_type.lower().replace(' ', '-')}"
+        return (
+            self.directory / f"{stem}.json",
+            self.directory / f"{stem}.raw.npy",
+            self.directory / f"{stem}.features.npy",
+        )
+
+    def _profiles(
+        self, season: str, season_type: str, stats: list[str], player_ids: list[int] | None
+    ) -> tuple[list[int], list[str], list[int], np.ndarray]:
+        rows = self.store.recent_profiles(
+            season, season_type, stats, self.window, min(self.min_games, self.window), player_ids
+        )
+        values = np.array([row[3:] for row in rows], dtype=np.float64).reshape(len(rows), len(stats))
+        return [int(r[0]) for r in rows], [str(r[1] or "") for r in rows], [int(r[2]) for r in rows], values
+
+    def _build(self, season: str, season_type: str, sources: dict[str, tuple[str, list[str]]]) -> dict[str, Any]:
+        meta_path, raw_path, features_path = self._paths(season, season_type)
+        stat_fields = {field for _, fields in sources.values() for field in fields}
+        stats = [stat for stat in STAT_COLUMNS if stat in stat_fields]
+        signatures = {path: signature for path, (signature, _) in sources.items()}
+        previous = self._read(season, season_type)
+
+        players_by_source = self.store.players_by_source(season, season_type)
+        changed = None
+        if (
+            previous is not None
+            and previous["stats"] == stats
+            and previous["window"] == self.window
+            and "source_players" in previous
+        ):
+            # Rewritten partitions get new hashed names, so a source that disappeared counts
+            # as changed too; its players are taken from the previous build's sidecar.
+            old = previous["sources"]
+            changed = [path for path in {*old, *signatures} if old.get(path) != signatures.get(path)]
+
+        if changed is None:
+            player_ids, names, games, raw = self._profiles(season, season_type, stats, None)
+            self.stats["full_builds"] += 1
+            self.stats["players_recomputed"] += len(player_ids)
+        else:
+            touched = {
+                pid
+                for path in changed
+                for pid in [*players_by_source.get(path, []), *previous["source_players"].get(path, [])]
+            }
+            rows = {
+                pid: (name, count, np.asarray(previous["raw"][i], dtype=np.float64))
+                for i, (pid, name, count) in enumerate(zip(previous["player_ids"], previous["names"], previous["games"]))
+                if pid not in touched
+            }
+            if touched:
+                fresh = self._profiles(season, season_type, stats, sorted(touched))
+                for pid, name, count, vector in zip(*fresh):
+                    rows[pid] = (name, count, vector)
+            player_ids = sorted(rows)
+            names = [rows[pid][0] for pid in player_ids]
+            games = [rows[pid][1] for pid in player_ids]
+            raw = np.array([rows[pid][2] for pid in player_ids], dtype=np.float64).reshape(len(player_ids), len(stats))
+            self.stats["incremental_builds"] += 1
+            self.stats["players_recomputed"] += len(touched)
+
+        # z-normalise each stat across players so high-volume stats do not dominate distances;
+        # stats a player has no value for sit at the league mean.
+        mean = np.nanmean(raw, axis=0) if len(raw) else np.zeros(len(stats))
+        std = np.nanstd(raw, axis=0) if len(raw) else np.ones(len(stats))
+        std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+        features = np.nan_to_num((raw - np.nan_to_num(mean)) / std).astype(np.float32)
+
+        digest = hashlib.blake2b(digest_size=8)
+        for path in sorted(signatures):
+            digest.update(f"{path}:{signatures[path]}\n".encode("utf-8"))
+        meta = {
+            "season": season,
+            "season_type": season_type,
+            "version": digest.hexdigest(),
+            "window": self.window,
+            "stats": stats,
+            "mean": np.nan_to_num(mean).round(6).tolist(),
+            "std": std.round(6).tolist(),
+            "player_ids": player_ids,
+            "names": names,
+            "games": games,
+            "sources": signatures,
+            "source_players": players_by_source,
+            "built_at": time.time(),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path, array in ((raw_path, raw.astype(np.float32)), (features_path, features)):
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as fh:
+                np.save(fh, array)
+            os.replace(tmp, path)
+        tmp = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(meta, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, meta_path)
+        return meta
+
+    def _read(self, season: str, season_type: str) -> dict[str, Any] | None:
+        meta_path, raw_path, features_path = self._paths(season, season_type)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            raw = np.load(raw_path, mmap_mode="r")
+            features = np.load(features_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if features.shape != (len(meta["player_ids"]), len(meta["stats"])) or raw.shape != features.shape:
+            return None
+        return {
+            **meta,
+            "raw": raw,
+            "features": features,
+            "rows": {pid: i for i, pid in enumerate(meta["player_ids"])},
+        }
+
+    def index(self, season: str, season_type: str) -> dict[str, Any]:
+        key = (season, season_type)
+        with self._lock:
+            loaded = self._loaded.get(key)
+            if loaded is not None and time.monotonic() - loaded["checked_at"] < self.check_seconds:
+                return loaded
+            sources = self.store.sources(season, season_type)
+            signatures = {path: signature for path, (signature, _) in sources.items()}
+            if loaded is None or loaded["sources"] != signatures:
+                # Another worker process may already have rebuilt the files.
+                loaded = self._read(season, season_type)
+                if loaded is None or loaded["sources"] != signatures:
+                    self._build(season, season_type, sources)
+                    loaded = self._read(season, season_type)
+            loaded["checked_at"] = time.monotonic()
+            self._loaded[key] = loaded
+            return loaded
+
+    def neighbors(
+        self, season: str, season_type: str, player_id: int, k: int = 10, metric: str = "cosine"
+    ) -> dict[str, Any] | None:
+        index = self.index(season, season_type)
+        row = index["rows"].get(int(player_id))
+        if row is None:
+            return None
+        self.stats["lookups"] += 1
+        if metric == "cosine":
+            # Normalised per query so only the memory-mapped matrix is kept, not a unit copy of it.
+            features = index["features"]
+            norms = np.linalg.norm(features, axis=1)
+            norms[norms == 0] = 1.0
+            scores = (features @ features[row]) / (norms * norms[row])
+            order = np.argsort(-scores, kind="stable")
+        else:
+            scores = np.linalg.norm(index["features"] - index["features"][row], axis=1)
+            order = np.argsort(scores, kind="stable")
+        order = order[order != row][: max(1, k)]
+
+        def profile(i: int) -> dict[str, float | None]:
+            return {
+                stat: None if not np.isfinite(value) else round(float(value), 3)
+                for stat, value in zip(index["stats"], index["raw"][i])
+            }
+
+        return {
+            "season": season,
+            "season_type": season_type,
+            "metric": metric,
+            "window": index["window"],
+            "stats": index["stats"],
+            "version": index["version"],
+            "player": {
+                "player_id": int(player_id),
+                "name": index["names"][row],
+                "games": index["games"][row],
+                "profile": profile(row),
+            },
+            "neighbors": [
+                {
+                    "player_id": index["player_ids"][i],
+                    "name": index["names"][i],
+                    "games": index["games"][i],
+                    "score": round(float(scores[i]), 4),
+                    "profile": profile(i),
+                }
+                for i in order
+            ],
+        }
+
+    def describe(self) -> dict[str, Any]:
+        with self._lock:
+            loaded = {
+                f"{season}::{season_type}": {"players": len(index["player_ids"]), "version": index["version"]}
+                for (season, season_type), index in self._loaded.items()
+            }
+        return {"path": str(self.directory), "window": self.window, "indexes": loaded, **self.stats}
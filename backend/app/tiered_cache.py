@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from diskcache import Cache
+
+GENERATION_KEY = "meta::generation"
+
+
+class TieredCache:
+    # Per-process memory tier in front of the diskcache directory shared by all workers.
+    # Any worker that clears entries writes a new generation token; the other workers notice
+    # it within sync_seconds and drop their memory tier.
+    # Values handed out from the memory tier are shared objects and must be treated as read-only.
+    # The memory tier is guarded by a lock: invalidation also runs from threadpool workers.
+
+    def __init__(self, disk: Cache, max_items: int = 256, sync_seconds: float = 1.0):
+        self.disk = disk
+        self.max_items = max(0, max_items)
+        self.sync_seconds = sync_seconds
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "invalidations": 0}
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generation: Any = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.sync_seconds:
+            return
+        self._checked_at = now
+        generation = self.disk.get(GENERATION_KEY)
+        if generation != self._generation:
+            with self._lock:
+                self._memory.clear()
+                self._generation = generation
+
+    def _remember(self, key: str, value: Any, expire_at: float | None) -> None:
+        if self.max_items == 0:
+            return
+        with self._lock:
+            self._memory[key] = (expire_at if expire_at is not None else float("inf"), value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Any:
+        self._sync()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[1]
+                self._memory.pop(key, None)
+
+        value, expire_at = self.disk.get(key, expire_time=True)
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["disk_hits"] += 1
+        self._remember(key, value, expire_at)
+        return value
+
+    def set(self, key: str, value: Any, expire: float) -> None:
+        # Entries are only written on a miss, so no other worker's memory tier can hold an older
+        # copy; clears go through invalidate().
+        self.disk.set(key, value, expire=expire, tag=time.time())
+        self._remember(key, value, time.time() + expire)
+
+    def invalidate(self) -> None:
+        token = uuid.uuid4().hex
+        self.disk.set(GENERATION_KEY, token)
+        with self._lock:
+            self._memory.clear()
+            self._generation = token
+        self._checked_at = time.monotonic()
+        self.stats["invalidations"] += 1
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "memory_items": len(self._memory),
+            "max_items": self.max_items,
+            "sync_seconds": self.sync_seconds,
+            **self.stats,
+        }
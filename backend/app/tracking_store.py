@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+
+class TrackingWarehouse:
+    # Read side of the per-season tracking warehouse built by scripts/build_tracking_data.py.
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._local = threading.local()
+
+    def _conn(self, season: str) -> sqlite3.Connection | None:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(season)
+        if conn is None:
+            path = self.directory / f"{season}.sqlite3"
+            if not path.exists():
+                return None
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+            conns[season] = conn
+        return conn
+
+    def player_rows(
+        self, season: str, season_type: str, measure: str, player_id: int
+    ) -> tuple[list[dict[str, Any]], set[str]] | None:
+        # Rows plus the days that were ingested; only those days are authoritative, the caller
+        # fills the rest of the season. None means nothing was ingested for this season/type/measure.
+        conn = self._conn(season)
+        if conn is None:
+            return None
+        ingested = {
+            game_date
+            for (game_date,) in conn.execute(
+                "SELECT game_date FROM ingest_log WHERE season_type = ? AND measure = ?",
+                (season_type, measure),
+            )
+        }
+        if not ingested:
+            return None
+        cursor = conn.execute(
+            "SELECT game_date, row FROM tracking"
+            " WHERE player_id = ? AND measure = ? AND season_type = ? ORDER BY game_date",
+            (int(player_id), measure, season_type),
+        )
+        return [{"GAME_DATE": game_date, **json.loads(row)} for game_date, row in cursor], ingested
+
+    def version(self, season: str) -> str:
+        conn = self._conn(season)
+        if conn is None:
+            return "none"
+        count, fetched_at = conn.execute("SELECT COUNT(*), MAX(fetched_at) FROM ingest_log").fetchone()
+        return f"{count}:{fetched_at or ''}"
+
+    def describe(self) -> dict[str, Any]:
+        seasons = sorted(p.stem for p in self.directory.glob("*.sqlite3")) if self.directory.exists() else []
+        out: dict[str, Any] = {"path": str(self.directory), "seasons": {}}
+        for season in seasons:
+            conn = self._conn(season)
+            if conn is None:
+                continue
+            rows = conn.execute(
+                "SELECT season_type, measure, COUNT(*), MAX(game_date) FROM ingest_log"
+                " GROUP BY season_type, measure ORDER BY season_type, measure"
+            ).fetchall()
+            out["seasons"][season] = [
+                {"season_type": st, "measure": measure, "days": days, "through": through}
+                for st, measure, days, through in rows
+            ]
+        return out
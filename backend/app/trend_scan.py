@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .gamelog_store import GamelogStore
+
+SCAN_SORTS = ("z", "delta", "slope")
+LABEL_COLUMNS = ["PLAYER_NAME", "TEAM_ABBREVIATION"]
+SKIP_FIELDS = {"SEASON_ID", "VIDEO_AVAILABLE"}
+
+
+def _grouped_sum(frame: pd.DataFrame, ids: pd.Series) -> pd.DataFrame:
+    return frame.groupby(ids, sort=True).sum(min_count=1)
+
+
+def scan_frame(frame: pd.DataFrame, stats: list[str], window: int, min_games: int) -> pd.DataFrame:
+    # One grouped pass over every player and stat: the mean of the last `window` games against
+    # the `window` games before them (delta), the least-squares slope per game across the
+    # recent window, and how far the recent mean sits from the player's season mean in
+    # standard errors (z).
+    frame = frame.sort_values(["PLAYER_ID", "GAME_DATE"], kind="stable")
+    grouped = frame.groupby("PLAYER_ID", sort=True)
+    games = grouped.size()
+    back = grouped.cumcount(ascending=False)
+    values = frame[stats]
+
+    recent_mask = back < window
+    previous_mask = (back >= window) & (back < 2 * window)
+    recent_ids = frame.loc[recent_mask, "PLAYER_ID"]
+    recent_values = values[recent_mask]
+    recent = recent_values.groupby(recent_ids, sort=True).mean()
+    previous = values[previous_mask].groupby(frame.loc[previous_mask, "PLAYER_ID"], sort=True).mean()
+
+    x = (window - 1 - back[recent_mask]).astype(float)
+    present = recent_values.notna()
+    xs = present.mul(x, axis=0)
+    n = present.groupby(recent_ids, sort=True).sum()
+    sx = _grouped_sum(xs, recent_ids)
+    sy = _grouped_sum(recent_values, recent_ids)
+    sxx = _grouped_sum(xs * xs, recent_ids)
+    sxy = _grouped_sum(recent_values.mul(x, axis=0), recent_ids)
+    denominator = n * sxx - sx * sx
+    slope = (n * sxy - sx * sy) / denominator.where(denominator != 0)
+
+    season_mean = grouped[stats].mean()
+    standard_error = grouped[stats].std() / np.sqrt(n.where(n > 0))
+    z = (recent - season_mean) / standard_error.where(standard_error > 0)
+
+    metrics = pd.concat(
+        {
+            "recent": recent,
+            "previous": previous.reindex(recent.index),
+            "delta": recent - previous.reindex(recent.index),
+            "slope": slope,
+            "z": z,
+            "season_avg": season_mean.reindex(recent.index),
+        },
+        axis=1,
+    )
+    long = metrics.stack(level=1, future_stack=True).rename_axis(["player_id", "stat"]).reset_index()
+    qualified = games[(games >= min_games) & (games > window)].index
+    long = long[long["player_id"].isin(qualified)]
+    labels = grouped[[c for c in LABEL_COLUMNS if c in frame.columns]].last()
+    long = long.join(labels, on="player_id").rename(columns={"PLAYER_NAME": "player_name", "TEAM_ABBREVIATION": "team"})
+    long["games"] = long["player_id"].map(games)
+    return long
+
+
+class TrendScanner:
+    # League-wide trend scans over the gamelog store. Each season type is held as a frame
+    # assembled from per-source pieces; when the store ingests new partitions only those
+    # sources are reloaded, and scans over an unchanged frame are served from memory.
+
+    def __init__(self, store: GamelogStore, max_scans: int = 64):
+        self.store = store
+        self.max_scans = max(1, max_scans)
+        self._lock = threading.Lock()
+        self._frames: dict[tuple[str, str], dict[str, Any]] = {}
+        self._scans: OrderedDict[tuple[Any, ...], pd.DataFrame] = OrderedDict()
+        self.stats = {"source_loads": 0, "frame_builds": 0, "scans": 0, "scan_hits": 0}
+
+    def _load_source(self, path: str, stat_fields: list[str]) -> pd.DataFrame:
+        rows = self.store.source_rows(path)
+        stats = [f for f in stat_fields if f not in SKIP_FIELDS]
+        piece = pd.DataFrame.from_records(rows, columns=["PLAYER_ID", "GAME_DATE", *LABEL_COLUMNS, *stats])
+        piece["PLAYER_ID"] = pd.to_numeric(piece["PLAYER_ID"], errors="coerce")
+        piece[stats] = piece[stats].apply(pd.to_numeric, errors="coerce")
+        self.stats["source_loads"] += 1
+        return piece.dropna(subset=["PLAYER_ID"]).astype({"PLAYER_ID": "int64"})
+
+    def frame(self, season: str, season_type: str) -> tuple[str, pd.DataFrame]:
+        sources = self.store.sources(season, season_type)
+        with self._lock:
+            state = self._frames.setdefault((season, season_type), {"pieces": {}, "frame": None, "version": ""})
+            pieces = state["pieces"]
+            changed = False
+            for path in [p for p in pieces if p not in sources]:
+                del pieces[path]
+                changed = True
+            for path, (signature, stat_fields) in sources.items():
+                if path not in pieces or pieces[path][0] != signature:
+                    pieces[path] = (signature, self._load_source(path, stat_fields))
+                    changed = True
+            if changed or state["frame"] is None:
+                parts = [piece for _, piece in pieces.values()]
+                state["frame"] = (
+                    pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["PLAYER_ID", "GAME_DATE"])
+                )
+                digest = hashlib.blake2b(digest_size=8)
+                for path in sorted(pieces):
+                    digest.update(f"{path}:{pieces[path][0]}\n".encode("utf-8"))
+                state["version"] = digest.hexdigest()
+                self.stats["frame_builds"] += 1
+            return state["version"], state["frame"]
+
+    def stat_fields(self, season: str, season_type: str) -> list[str]:
+        _, frame = self.frame(season, season_type)
+        return [c for c in frame.columns if c not in {"PLAYER_ID", "GAME_DATE", *LABEL_COLUMNS}]
+
+    def scan(
+        self,
+        season: str,
+        season_type: str,
+        window: int,
+        stats: list[str] | None = None,
+        min_games: int = 0,
+        sort: str = "z",
+        falling: bool = False,
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        version, frame = self.frame(season, season_type)
+        available = [c for c in frame.columns if c not in {"PLAYER_ID", "GAME_DATE", *LABEL_COLUMNS}]
+        selected = [s for s in (stats or available) if s in available]
+        key = (season, season_type, version, window, tuple(selected), min_games)
+        with self._lock:
+            result = self._scans.get(key)
+            if result is not None:
+                self._scans.move_to_end(key)
+                self.stats["scan_hits"] += 1
+        if result is None:
+            result = scan_frame(frame, selected, window, min_games) if selected and len(frame) else pd.DataFrame()
+            with self._lock:
+                self._scans[key] = result
+                while len(self._scans) > self.max_scans:
+                    self._scans.popitem(last=False)
+                self.stats["scans"] += 1
+
+        ranked = result.dropna(subset=[sort]).sort_values(sort, ascending=falling, kind="stable") if len(result) else result
+        top = ranked.head(limit).round(4)
+        rows = top.astype(object).where(top.notna(), None).to_dict(orient="records") if len(top) else []
+        return {
+            "season": season,
+            "season_type": season_type,
+            "window": window,
+            "min_games": min_games,
+            "sort": sort,
+            "order": "falling" if falling else "rising",
+            "stats": selected,
+            "data_version": version,
+            "candidates": int(len(ranked)),
+            "row_count": len(rows),
+            "rows": rows,
+        }
+
+    def describe(self) -> dict[str, Any]:
+        with self._lock:
+            frames = {
+                f"{season}::{season_type}": {
+                    "sources": len(state["pieces"]),
+                    "rows": 0 if state["frame"] is None else len(state["frame"]),
+                }
+                for (season, season_type), state in self._frames.items()
+            }
+            return {"frames": frames, "cached_scans": len(self._scans), **self.stats}
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Measure cached /api/query throughput for different uvicorn worker counts.
+
+Run from the backend directory:
+
+    python benchmarks/cached_throughput.py --workers 1,2,4 --seconds 10
+
+A temporary cache directory is seeded with a synthetic leaguedashplayerstats frame, so no
+upstream NBA calls are made.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+QUERY = {"endpoint": "leaguedashplayerstats", "params": {"season": "2024-25"}, "max_rows": 1500}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_cache(cache_dir: str, rows: int) -> None:
+    os.environ["CACHE_DIR"] = cache_dir
+    os.environ["WARMUP_ENABLED"] = "0"
+    sys.path.insert(0, str(BACKEND_DIR))
+    from app import main
+
+    _, endpoint_cls = main._resolve_endpoint(QUERY["endpoint"])
+    canonical = main._canonical_params(endpoint_cls, QUERY["params"])
+    cache_key = (
+        f"query::stats::{QUERY['endpoint']}::0::{QUERY['max_rows']}::{main._params_key(canonical)}"
+    )
+    columns = ["PLAYER_ID", "PLAYER_NAME", "TEAM_ABBREVIATION", "GP", "MIN", "PTS", "REB", "AST", "FG_PCT"]
+
+    async def load():
+        frame_rows = [
+            {
+                "PLAYER_ID": 1000 + i,
+                "PLAYER_NAME": f"Player {i}",
+                "TEAM_ABBREVIATION": "BOS",
+                "GP": 60,
+                "MIN": 31.5,
+                "PTS": 20.1 + i % 7,
+                "REB": 5.5,
+                "AST": 4.2,
+                "FG_PCT": 0.471,
+                "headshot_url": main._cdn_headshot_url(1000 + i),
+            }
+            for i in range(rows)
+        ]
+        return {
+            "endpoint": QUERY["endpoint"],
+            "domain": "stats",
+            "dataset_index": 0,
+            "dataset_count": 1,
+            "params_used": {**canonical, "timeout": 30},
+            "row_count": len(frame_rows),
+            "columns": columns,
+            "numeric_fields": columns[3:],
+            "rows": frame_rows,
+        }
+
+    asyncio.run(main._cached_content_call(cache_key, load, ("columns", "numeric_fields", "rows")))
+    main._endpoint_registry()
+
+
+async def hammer(base_url: str, seconds: float, concurrency: int) -> tuple[int, int]:
+    done = 0
+    failed = 0
+    deadline = time.monotonic() + seconds
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal done, failed
+        while time.monotonic() < deadline:
+            response = await client.post(f"{base_url}/api/query", json=QUERY)
+            if response.status_code == 200:
+                done += 1
+            else:
+                failed += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return done, failed
+
+
+def wait_ready(base_url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+def run_one(cache_dir: str, workers: int, seconds: float, concurrency: int) -> tuple[float, int]:
+    port = free_port()
+    env = {**os.environ, "CACHE_DIR": cache_dir, "WARMUP_ENABLED": "0"}
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=str(BACKEND_DIR),
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url)
+        asyncio.run(hammer(base_url, 1.0, concurrency))
+        done, failed = asyncio.run(hammer(base_url, seconds, concurrency))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return done / seconds, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cached /api/query throughput by worker count")
+    parser.add_argument("--workers", default="1,2,4", help="Comma separated worker counts")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=500, help="Rows in the cached frame")
+    args = parser.parse_args()
+
+    counts = [int(x) for x in args.workers.split(",") if x.strip()]
+    with tempfile.TemporaryDirectory(prefix="nba-viz-bench-") as cache_dir:
+        seed_cache(cache_dir, args.rows)
+        print(f"cores={os.cpu_count()} rows={args.rows} concurrency={args.concurrency}", flush=True)
+        baseline = None
+        for workers in counts:
+            rps, failed = run_one(cache_dir, workers, args.seconds, args.concurrency)
+            baseline = baseline or rps
+            print(
+                f"workers={workers:<3} req/s={rps:9.1f} speedup={rps / baseline:5.2f}x failed={failed}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
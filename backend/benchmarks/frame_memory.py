@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Measure memory per cached row for row dicts versus the columnar cache representation.
+
+Run from the backend directory:
+
+    python benchmarks/frame_memory.py --rows 4000
+
+A synthetic leaguedashplayerstats-shaped frame is built in process, so no upstream NBA calls
+are made. "heap" is what tracemalloc sees while the frame is held (the warm tier), "pickled"
+is what diskcache stores for the blob.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.columnar import compact_content, expand_content  # noqa: E402
+
+TEAMS = ["ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GSW", "HOU", "IND", "LAC", "LAL", "MEM",
+         "MIA", "MIL", "MIN", "NOP", "NYK", "OKC", "ORL", "PHI", "PHX", "POR", "SAC", "SAS", "TOR", "UTA", "WAS"]
+STATS = ["MIN", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB",
+         "AST", "TOV", "STL", "BLK", "PF", "PTS", "PLUS_MINUS"]
+
+
+def synthetic_rows(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        team = rng.choice(TEAMS)
+        row = {
+            "PLAYER_ID": 1_600_000 + i,
+            "PLAYER_NAME": f"Player {i}",
+            "TEAM_ID": 1_610_612_700 + TEAMS.index(team),
+            "TEAM_ABBREVIATION": team,
+            "AGE": float(rng.randint(19, 39)),
+            "GP": rng.randint(1, 82),
+            "W": rng.randint(0, 60),
+            "L": rng.randint(0, 60),
+        }
+        for stat in STATS:
+            row[stat] = round(rng.uniform(0, 30), 3) if rng.random() > 0.02 else None
+        row["headshot_url"] = f"https://cdn.nba.com/headshots/nba/latest/260x190/{row['PLAYER_ID']}.png"
+        rows.append(row)
+    return rows
+
+
+def measure(build) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return value, held
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=4000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    content_rows = synthetic_rows(args.rows, args.seed)
+    # Rows are rebuilt inside measure() so the list-of-dicts figure counts its own dicts and values.
+    records, record_bytes = measure(lambda: {"rows": pickle.loads(pickle.dumps(content_rows))})
+    compact, compact_bytes = measure(lambda: compact_content({"rows": pickle.loads(pickle.dumps(content_rows))}))
+
+    started = time.perf_counter()
+    restored = expand_content(compact)
+    expand_ms = (time.perf_counter() - started) * 1000
+    if restored != records:
+        raise SystemExit("round trip mismatch")
+
+    n = args.rows
+    record_pickle = len(pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+    compact_pickle = len(pickle.dumps(compact, protocol=pickle.HIGHEST_PROTOCOL))
+    print(f"rows={n} columns={len(content_rows[0])}")
+    print(f"{'form':<10}{'heap B/row':>12}{'pickled B/row':>15}")
+    print(f"{'records':<10}{record_bytes / n:>12.1f}{record_pickle / n:>15.1f}")
+    print(f"{'columnar':<10}{compact_bytes / n:>12.1f}{compact_pickle / n:>15.1f}")
+    print(f"heap x{record_bytes / compact_bytes:.1f} smaller, pickled x{record_pickle / compact_pickle:.1f} smaller;"
+          f" to_records() {expand_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -60,14 +60,50 @@ function slugSeasonType(seasonType) {
   return String(seasonType || "Regular Season").toLowerCase().replace(/\s+/g, "-");
 }
 
-async function fetchJson(path) {
-  const response = await fetch(path, { cache: "no-store" });
+// Data files listed with a sha256 in the manifest have content-hashed names and never change,
+// so the browser may serve them from cache; the manifest itself is always revalidated.
+async function fetchJson(path, cacheMode = "no-store") {
+  const response = await fetch(path, { cache: cacheMode });
   if (!response.ok) {
     throw new Error(`HTTP ${response.status} for ${path}`);
   }
   return response.json();
 }
 
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// Gamelog files written as "columnar-v1" hold one array per column; string columns index into
+// a per-column dictionary and date columns are days since 1970-01-01.
+function decodeGamelogs(payload) {
+  if (payload?.format !== "columnar-v1") return payload;
+  const columns = payload.columns || [];
+  const dictionaries = payload.dictionaries || {};
+  const dateColumns = new Set(payload.date_columns || []);
+  const count = columns.length ? payload.values[columns[0]].length : 0;
+  const rows = new Array(count);
+  for (let i = 0; i < count; i += 1) rows[i] = {};
+  for (const column of columns) {
+    const values = payload.values[column];
+    const lookup = dictionaries[column];
+    const isDate = dateColumns.has(column);
+    for (let i = 0; i < count; i += 1) {
+      let value = values[i];
+      if (value !== null && lookup) value = lookup[value];
+      else if (value !== null && isDate) value = new Date(value * DAY_MS).toISOString().slice(0, 10);
+      rows[i][column] = value;
+    }
+  }
+  return { ...payload, rows };
+}
+
+function manifestPath(entry) {
+  return typeof entry === "string" ? entry : entry?.path;
+}
+
+function fetchDataFile(entry) {
+  return fetchJson(`${DATA_BASE}/${manifestPath(entry)}`, entry?.sha256 ? "force-cache" : "no-store");
+}
+
 function rollingAverage(values, windowSize) {
   const out = [];
   for (let i = 0; i < values.length; i += 1) {
@@ -78,6 +114,12 @@ function rollingAverage(values, windowSize) {
   return out;
 }
 
+function ordinal(n) {
+  const teen = n % 100 >= 11 && n % 100 <= 13;
+  const suffix = teen ? "th" : { 1: "st", 2: "nd", 3: "rd" }[n % 10] || "th";
+  return `${n}${suffix}`;
+}
+
 function toDateLabel(value) {
   if (!value) return "";
   const d = new Date(value);
@@ -99,7 +141,10 @@ async function blobToDataUrl(blob) {
 }
 
 async function fetchImageAsDataUrl(url) {
-  const response = await fetch(url, { mode: "cors", cache: "no-store" });
+  // Cross-origin images may sit in the HTTP cache from a non-CORS <img> load, so only those
+  // bypass it; same-origin assets come from the cache.
+  const sameOrigin = new URL(url, window.location.href).origin === window.location.origin;
+  const response = await fetch(url, { mode: "cors", cache: sameOrigin ? "default" : "no-store" });
   if (!response.ok) throw new Error(`Image fetch failed: ${response.status}`);
   const blob = await response.blob();
   return blobToDataUrl(blob);
@@ -246,8 +291,7 @@ function App() {
       setStatField("");
 
       try {
-        const playersPath = manifest?.files?.players?.[season] || `players/${season}.json`;
-        const payload = await fetchJson(`${DATA_BASE}/${playersPath}`);
+        const payload = await fetchDataFile(manifest?.files?.players?.[season] || `players/${season}.json`);
         const roster = (payload.players || [])
           .filter((p) => p.is_active !== false)
           .map(withHeadshot)
@@ -304,23 +348,84 @@ function App() {
       return logsCacheRef.current.get(cacheKey);
     }
 
-    const path =
-      manifest?.files?.gamelogs?.[selectedSeason]?.[typeSlug] ||
-      `gamelogs/${selectedSeason}/${typeSlug}.json`;
-    const payload = await fetchJson(`${DATA_BASE}/${path}`);
+    let payload = await fetchDataFile(
+      manifest?.files?.gamelogs?.[selectedSeason]?.[typeSlug] || `gamelogs/${selectedSeason}/${typeSlug}.json`
+    );
+    if (manifest?.gamelog_layout) {
+      // Partitioned layout: the manifest points at an index of weekly files.
+      const parts = await Promise.all(
+        (payload.partitions || []).map(async (part) => decodeGamelogs(await fetchDataFile(part)))
+      );
+      payload = { ...payload, rows: parts.flatMap((part) => part.rows || []) };
+    }
+    logsCacheRef.current.set(cacheKey, payload);
+    return payload;
+  }
+
+  async function getPlayerLogs(selectedSeason, selectedSeasonType, selectedPlayerId) {
+    const typeSlug = slugSeasonType(selectedSeasonType);
+    const shardIndexEntry = manifest?.files?.player_gamelogs?.[selectedSeason]?.[typeSlug];
+    if (!shardIndexEntry) {
+      const payload = await getSeasonLogs(selectedSeason, selectedSeasonType);
+      return {
+        ...payload,
+        rows: (payload.rows || []).filter((r) => Number(r.PLAYER_ID) === Number(selectedPlayerId))
+      };
+    }
+
+    const indexKey = `${selectedSeason}::${typeSlug}::players`;
+    if (!logsCacheRef.current.has(indexKey)) {
+      logsCacheRef.current.set(indexKey, await fetchDataFile(shardIndexEntry));
+    }
+    const shard = logsCacheRef.current.get(indexKey).players?.[String(selectedPlayerId)];
+    if (!shard) {
+      return { rows: [], stat_fields: [] };
+    }
+
+    const cacheKey = `${selectedSeason}::${typeSlug}::${selectedPlayerId}`;
+    if (logsCacheRef.current.has(cacheKey)) {
+      return logsCacheRef.current.get(cacheKey);
+    }
+    const payload = decodeGamelogs(await fetchDataFile(shard));
     logsCacheRef.current.set(cacheKey, payload);
     return payload;
   }
 
+  async function getPlayerSummary(selectedSeason, selectedSeasonType, selectedPlayerId) {
+    const typeSlug = slugSeasonType(selectedSeasonType);
+    const entry = manifest?.files?.player_summaries?.[selectedSeason]?.[typeSlug];
+    if (!entry) return null;
+
+    // The index maps player ids to content hashes; only the selected player's file is fetched.
+    const indexKey = `${selectedSeason}::${typeSlug}::summaries`;
+    if (!logsCacheRef.current.has(indexKey)) {
+      logsCacheRef.current.set(indexKey, await fetchDataFile(entry));
+    }
+    const index = logsCacheRef.current.get(indexKey);
+    const hash = index.players?.[String(selectedPlayerId)];
+    if (!hash) return null;
+
+    const cacheKey = `${selectedSeason}::${typeSlug}::summary::${selectedPlayerId}`;
+    if (!logsCacheRef.current.has(cacheKey)) {
+      logsCacheRef.current.set(
+        cacheKey,
+        await fetchDataFile({ path: `${index.dir}/${selectedPlayerId}.${hash}.json`, sha256: hash })
+      );
+    }
+    return logsCacheRef.current.get(cacheKey);
+  }
+
   async function loadTrends() {
     if (!playerId) return;
     setLoading(true);
     setError("");
 
     try {
-      const payload = await getSeasonLogs(season, seasonType);
-      const rows = (payload.rows || [])
-        .filter((r) => Number(r.PLAYER_ID) === Number(playerId))
+      const [payload, summary] = await Promise.all([
+        getPlayerLogs(season, seasonType, playerId),
+        getPlayerSummary(season, seasonType, playerId).catch(() => null)
+      ]);
+      const rows = [...(payload.rows || [])]
         .sort((a, b) => new Date(a.GAME_DATE) - new Date(b.GAME_DATE));
 
       if (!rows.length) {
@@ -341,7 +446,8 @@ function App() {
         season_type: seasonType,
         count: rows.length,
         rows,
-        stat_fields: statFields
+        stat_fields: statFields,
+        summary
       });
     } catch (err) {
       setTrendData(null);
@@ -547,6 +653,23 @@ function App() {
     };
   }, [trendData, statField, rollingWindow]);
 
+  const summaryLine = useMemo(() => {
+    const summary = trendData?.summary;
+    const index = summary?.stats?.indexOf(statField) ?? -1;
+    if (index < 0) return "";
+
+    const pctStat = isPctStat(statField);
+    const format = (value) =>
+      value === null || value === undefined ? "-" : pctStat ? `${(value * 100).toFixed(1)}%` : value.toFixed(1);
+    const parts = [`Season avg ${format(summary.avg[index])}`];
+    for (const windowSize of summary.windows) {
+      parts.push(`Last ${windowSize} ${format(summary[`last${windowSize}`]?.[index])}`);
+    }
+    parts.push(`EWMA ${format(summary.ewma[index])}`);
+    if (summary.pct[index] !== null) parts.push(`${ordinal(Math.round(summary.pct[index]))} pct`);
+    return parts.join(" | ");
+  }, [trendData, statField]);
+
   return (
     <div className="app">
       <div className="trend-card">
@@ -702,6 +825,7 @@ function App() {
       </div>
 
       <p className="small">{loading ? "Loading..." : `Rows: ${trendData?.count || 0}`}</p>
+      {summaryLine ? <p className="small">{summaryLine}</p> : null}
     </div>
   );
 }
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageOps
+
+from download_headshots import manifest_players_files
+
+HASH_CHARS = 12
+# NBA CDN headshots are 260x190; every thumbnail and atlas cell keeps that aspect.
+CELL_ASPECT = 190 / 260
+GROUPS = ("season", "team")
+
+
+def cell_size(width: int) -> tuple[int, int]:
+    return width, max(1, round(width * CELL_ASPECT))
+
+
+def render(source: Path, size: tuple[int, int]) -> Image.Image:
+    with Image.open(source) as img:
+        return ImageOps.fit(img.convert("RGBA"), size, Image.Resampling.LANCZOS)
+
+
+def save_webp(image: Image.Image, path: Path, quality: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    image.save(tmp, format="WEBP", quality=quality)
+    os.replace(tmp, path)
+
+
+def write_thumbnail(source: Path, target: Path, size: tuple[int, int], quality: int) -> bool:
+    if target.exists() and target.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+        return False
+    save_webp(render(source, size), target, quality)
+    return True
+
+
+class Renders:
+    # Resized headshots shared by every atlas of one run (a player sits in one atlas per season).
+
+    def __init__(self, sources: dict[int, Path]):
+        self.sources = sources
+        self.images: dict[tuple[int, tuple[int, int]], Image.Image] = {}
+
+    def get(self, pid: int, size: tuple[int, int]) -> Image.Image:
+        image = self.images.get((pid, size))
+        if image is None:
+            image = self.images[(pid, size)] = render(self.sources[pid], size)
+        return image
+
+
+def atlas_groups(data_dir: Path, group: str, available: set[int]) -> dict[str, list[int]]:
+    # Players with a local headshot, per season in the manifest or per team (taken from the
+    # newest season a player appears in).
+    files = manifest_players_files(data_dir)
+    out: dict[str, set[int]] = {}
+    seen: set[int] = set()
+    for season in sorted(files, reverse=True):
+        payload = json.loads(files[season].read_text(encoding="utf-8"))
+        for p in payload.get("players", []):
+            try:
+                pid = int(p.get("player_id") or 0)
+            except (TypeError, ValueError):
+                continue
+            if pid not in available:
+                continue
+            if group == "season":
+                out.setdefault(season, set()).add(pid)
+            elif pid not in seen:
+                out.setdefault(str(p.get("team") or "FA"), set()).add(pid)
+            seen.add(pid)
+    return {name: sorted(pids) for name, pids in sorted(out.items())}
+
+
+def write_atlas(
+    out_dir: Path,
+    name: str,
+    players: list[int],
+    renders: Renders,
+    source_digests: dict[int, str],
+    width: int,
+    columns: int,
+    quality: int,
+) -> dict[str, Any]:
+    # Named by a digest of the inputs, so an atlas whose players and source images did not
+    # change is neither re-rendered nor renamed.
+    cell_w, cell_h = cell_size(width)
+    rows = math.ceil(len(players) / columns)
+    digest = hashlib.sha256(f"{cell_w}x{cell_h}:{columns}:{quality}\n".encode("utf-8"))
+    for pid in players:
+        digest.update(f"{pid}:{source_digests[pid]}\n".encode("utf-8"))
+    rel = f"atlas/{name}.{width}.{digest.hexdigest()[:HASH_CHARS]}.webp"
+    path = out_dir / rel
+    written = False
+    if not path.exists():
+        canvas = Image.new("RGBA", (columns * cell_w, rows * cell_h), (0, 0, 0, 0))
+        for i, pid in enumerate(players):
+            canvas.paste(renders.get(pid, (cell_w, cell_h)), ((i % columns) * cell_w, (i // columns) * cell_h))
+        save_webp(canvas, path, quality)
+        written = True
+    return {
+        "path": rel,
+        "width": columns * cell_w,
+        "height": rows * cell_h,
+        "cell_width": cell_w,
+        "cell_height": cell_h,
+        "bytes": path.stat().st_size,
+        "written": written,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build WebP headshot thumbnails and sprite atlases")
+    parser.add_argument("--headshots-dir", default="frontend/public/headshots", help="Directory of {player_id}.png files")
+    parser.add_argument("--data-dir", default="frontend/public/data", help="Static data directory holding manifest.json")
+    parser.add_argument("--out-dir", default="", help="Output directory (default: --headshots-dir)")
+    parser.add_argument("--sizes", default="48,96", help="Comma separated thumbnail widths in pixels")
+    parser.add_argument("--atlas-sizes", default="48", help="Comma separated widths that also get sprite atlases")
+    parser.add_argument("--group", choices=GROUPS, default="season", help="One atlas per season or per team")
+    parser.add_argument("--max-atlas-width", type=int, default=2048)
+    parser.add_argument("--quality", type=int, default=80, help="WebP quality")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    headshots_dir = Path(args.headshots_dir)
+    out_dir = Path(args.out_dir) if args.out_dir else headshots_dir
+    sizes = sorted({int(x) for x in args.sizes.split(",") if x.strip()})
+    atlas_sizes = sorted({int(x) for x in args.atlas_sizes.split(",") if x.strip()})
+    started = time.monotonic()
+
+    sources = {int(p.stem): p for p in headshots_dir.glob("*.png") if p.stem.isdigit()}
+    jobs = [
+        (sources[pid], out_dir / "thumbs" / str(width) / f"{pid}.webp", cell_size(width), args.quality)
+        for pid in sorted(sources)
+        for width in sizes
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        thumbs_written = sum(pool.map(lambda job: write_thumbnail(*job), jobs))
+    print(f"[build] thumbnails: {thumbs_written} written, {len(jobs) - thumbs_written} up to date", flush=True)
+
+    groups = atlas_groups(Path(args.data_dir), args.group, set(sources))
+    source_digests = {
+        pid: hashlib.sha256(sources[pid].read_bytes()).hexdigest() for pid in {p for ps in groups.values() for p in ps}
+    }
+    renders = Renders(sources)
+    atlases: dict[str, dict[str, Any]] = {}
+    atlas_jobs = []
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for name, players in groups.items():
+            for width in atlas_sizes:
+                columns = max(1, min(len(players), args.max_atlas_width // cell_size(width)[0]))
+                atlases.setdefault(name, {"players": players, "columns": {}, "images": {}})
+                atlases[name]["columns"][str(width)] = columns
+                atlas_jobs.append(
+                    (name, width, pool.submit(
+                        write_atlas, out_dir, name, players, renders, source_digests, width, columns, args.quality
+                    ))
+                )
+        for name, width, job in atlas_jobs:
+            atlases[name]["images"][str(width)] = job.result()
+    atlases_written = sum(1 for entry in atlases.values() for image in entry["images"].values() if image.pop("written"))
+
+    atlas_map = {
+        "group": args.group,
+        "sizes": sizes,
+        "thumbnails": "thumbs/{size}/{player_id}.webp",
+        "atlases": atlases,
+    }
+    map_path = out_dir / "atlas.json"
+    try:
+        previous = json.loads(map_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    if previous != atlas_map:
+        map_path.write_text(json.dumps(atlas_map, separators=(",", ":")), encoding="utf-8")
+
+    # The previous generation stays on disk for one more run: pages and cached API responses
+    # built from the old atlas.json still point at it.
+    keep = {image["path"] for entry in atlases.values() for image in entry["images"].values()}
+    if previous != atlas_map:
+        for entry in (previous.get("atlases") or {}).values():
+            keep.update(image["path"] for image in entry.get("images", {}).values())
+    for stale in (out_dir / "atlas").glob("*.webp"):
+        if f"atlas/{stale.name}" not in keep:
+            stale.unlink()
+
+    atlas_bytes = sum(image["bytes"] for entry in atlases.values() for image in entry["images"].values())
+    print(
+        f"[build] headshot assets done in {time.monotonic() - started:.1f}s: {len(sources)} headshots,"
+        f" {sum(len(entry['images']) for entry in atlases.values())} atlases ({atlases_written} written, {atlas_bytes} bytes) -> {out_dir}",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,94 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import gzip
+import hashlib
 import json
 import os
+import random
 import re
+import resource
+import shutil
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
+import pandas as pd
+import requests
 from nba_api.stats.endpoints import leaguegamelog
+from nba_api.stats.library.http import STATS_HEADERS, NBAStatsHTTP
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 SEASON_TYPES = ["Regular Season", "Playoffs"]
 DEFAULT_SEASONS = ["2025-26", "2024-25", "2023-24"]
+MAX_ATTEMPTS = 5
+GAMELOG_LAYOUT = "weekly"
+GAMELOG_FORMAT = "columnar-v1"
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+HASH_CHARS = 12
+HASHED_NAME = re.compile(r"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{12})\.json$")
+SUMMARY_WINDOWS = [5, 10]
+SUMMARY_EWMA_SPAN = 10
+SUMMARY_MIN_GAMES = 5
+SUMMARY_SKIP_FIELDS = {"SEASON_ID", "VIDEO_AVAILABLE"}
+REPORT_NAME = "build-report.json"
+
+
+class RateLimiter:
+    # Spaces upstream calls from all worker threads at least min_interval apart.
+
+    def __init__(self, min_interval: float):
+        self.min_interval = max(0.0, min_interval)
+        self.calls = 0
+        self.retries = 0
+        self.waited_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+            self.calls += 1
+            self.waited_seconds += slot - now
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record_retry(self, delay: float = 0.0) -> None:
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += delay
+
+
+def call_with_retries(label: str, fn: Callable[[], Any], limiter: RateLimiter) -> Any:
+    last_error: Exception | None = None
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        limiter.acquire()
+        try:
+            return fn()
+        except Exception as err:
+            last_error = err
+            print(f"[warn] {label} failed attempt {attempt}/{MAX_ATTEMPTS}: {err}", flush=True)
+            if attempt == MAX_ATTEMPTS:
+                break
+            # Exponential backoff with jitter so workers that failed together do not retry together.
+            delay = min(30.0, 2.0 ** attempt) * random.uniform(0.75, 1.25)
+            limiter.record_retry(delay)
+            time.sleep(delay)
+    raise RuntimeError(f"{label} failed: {last_error}")
+
 
 def season_type_slug(value: str) -> str:
     return re.sub(r"\s+", "-", value.strip().lower())
@@ -42,6 +118,83 @@ def extract_rows(payload: dict[str, Any], set_name: str | None = None) -> list[d
     return rows
 
 
+def iter_result_set_rows(chunks: Iterable[str], set_name: str) -> Iterator[dict[str, Any]]:
+    # Incremental version of extract_rows: rowSet entries are decoded one at a time from the
+    # text chunks, so only the current row and the unread part of one chunk are held in memory.
+    decoder = json.JSONDecoder()
+    source = iter(chunks)
+    buf = ""
+    pos = 0
+
+    def fill() -> bool:
+        nonlocal buf, pos
+        chunk = next(source, None)
+        if chunk is None:
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def seek(pattern: re.Pattern[str]) -> None:
+        nonlocal pos
+        while True:
+            match = pattern.search(buf, pos)
+            if match:
+                pos = match.end()
+                return
+            # Keep a short tail so a key split across two chunks is still found.
+            pos = max(pos, len(buf) - 256)
+            if not fill():
+                raise ValueError(f"{set_name}: {pattern.pattern} not found in response")
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                raise ValueError(f"{set_name}: response ended inside rowSet")
+
+    def decode() -> Any:
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                value, pos = decoder.raw_decode(buf, pos)
+                return value
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+
+    seek(re.compile(r'"name"\s*:\s*"' + re.escape(set_name) + '"', re.IGNORECASE))
+    seek(re.compile(r'"headers"\s*:\s*'))
+    headers = decode()
+    seek(re.compile(r'"rowSet"\s*:\s*\['))
+    while peek() != "]":
+        row = decode()
+        yield {headers[i]: row[i] if i < len(row) else None for i in range(len(headers))}
+    # Read the rest of the body so archiving sources see a complete response.
+    for _ in source:
+        pass
+
+
+def current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No /proc (macOS): fall back to the process peak.
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
 def to_float(value: Any) -> float | None:
     try:
         out = float(value)
@@ -66,8 +219,15 @@ def infer_stat_fields(rows: list[dict[str, Any]]) -> list[str]:
     return sorted(set(out))
 
 
-def build_players_from_gamelogs(season: str, gamelog_payloads: list[dict[str, Any]]) -> dict[str, Any]:
-    by_player: dict[int, dict[str, Any]] = {}
+def build_players_from_gamelogs(
+    season: str,
+    gamelog_payloads: list[dict[str, Any]],
+    existing: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    # With an existing players payload only the new rows are folded in (incremental mode).
+    by_player: dict[int, dict[str, Any]] = {
+        int(p["player_id"]): dict(p) for p in (existing or {}).get("players", [])
+    }
     for payload in gamelog_payloads:
         for row in payload.get("rows", []):
             try:
@@ -99,81 +259,319 @@ def build_players_from_gamelogs(season: str, gamelog_payloads: list[dict[str, An
     return {"season": season, "count": len(players), "players": players}
 
 
-def build_gamelogs(season: str, season_type: str) -> dict[str, Any]:
-    payload = None
-    last_error: Exception | None = None
-    for attempt in range(1, 6):
+def gamelog_request(season: str, season_type: str, game_date: date | None = None) -> tuple[str, dict[str, Any]]:
+    date_mmddyyyy = game_date.strftime("%m/%d/%Y") if game_date else ""
+    endpoint = leaguegamelog.LeagueGameLog(
+        counter=0,
+        direction="ASC",
+        league_id="00",
+        player_or_team_abbreviation="P",
+        season=season,
+        season_type_all_star=season_type,
+        sorter="DATE",
+        date_from_nullable=date_mmddyyyy,
+        date_to_nullable=date_mmddyyyy,
+        get_request=False,
+    )
+    return endpoint.endpoint, dict(endpoint.parameters)
+
+
+def fetch_chunks(endpoint: str, params: dict[str, Any], stats: dict[str, Any] | None = None) -> Iterator[str]:
+    # `stats`, when given, receives the time to response headers and the body size.
+    started = time.monotonic()
+    response = requests.get(
+        NBAStatsHTTP.base_url.format(endpoint=endpoint),
+        params=sorted(params.items()),
+        headers=STATS_HEADERS,
+        timeout=90,
+        stream=True,
+    )
+    with response:
+        if stats is not None:
+            stats["status"] = response.status_code
+            stats["latency_seconds"] = round(time.monotonic() - started, 3)
+        response.raise_for_status()
+        text = codecs.getincrementaldecoder("utf-8")()
+        for chunk in response.iter_content(chunk_size=1 << 16):
+            if stats is not None:
+                stats["bytes"] = stats.get("bytes", 0) + len(chunk)
+            yield text.decode(chunk)
+        yield text.decode(b"", final=True)
+
+
+def archive_stamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+class ResponseArchive:
+    # Raw upstream responses stored as {root}/{endpoint}/{params digest}/{fetched at}.json.gz,
+    # with the parameters themselves in params.json next to them. Stamps sort chronologically.
+
+    def __init__(self, root: Path, keep: int = 3):
+        self.root = root
+        self.keep = max(1, keep)
+
+    def directory(self, endpoint: str, params: dict[str, Any]) -> Path:
+        key = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        return self.root / endpoint / hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    def latest(self, endpoint: str, params: dict[str, Any], since: str | None = None) -> Path | None:
+        candidates = sorted(self.directory(endpoint, params).glob("*.json.gz"))
+        if since is not None:
+            candidates = [path for path in candidates if path.name >= since]
+        return candidates[-1] if candidates else None
+
+    def record(self, endpoint: str, params: dict[str, Any], chunks: Iterable[str]) -> Iterator[str]:
+        # Tees the response into the archive while it is being parsed. The file only gets its
+        # final name once the whole body has been read, so a dropped connection leaves nothing.
+        directory = self.directory(endpoint, params)
+        directory.mkdir(parents=True, exist_ok=True)
+        params_path = directory / "params.json"
+        if not params_path.exists():
+            dump_json(params_path, {"endpoint": endpoint, "params": params})
+        stamp = archive_stamp()
+        partial = directory / f"{stamp}.json.gz.partial"
         try:
-            endpoint = leaguegamelog.LeagueGameLog(
-                counter=0,
-                direction="ASC",
-                league_id="00",
-                player_or_team_abbreviation="P",
-                season=season,
-                season_type_all_star=season_type,
-                sorter="DATE",
-                date_from_nullable="",
-                date_to_nullable="",
-                timeout=90,
-                get_request=True,
-            )
-            payload = endpoint.get_dict()
-            break
+            with gzip.open(partial, "wt", encoding="utf-8", compresslevel=6) as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+                    yield chunk
+            partial.rename(directory / f"{stamp}.json.gz")
+            for stale in sorted(directory.glob("*.json.gz"))[: -self.keep]:
+                stale.unlink(missing_ok=True)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    @staticmethod
+    def replay(path: Path) -> Iterator[str]:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            while chunk := fh.read(1 << 16):
+                yield chunk
+
+    def date_fetches(self, endpoint: str, season: str, season_type: str, since: str) -> dict[str, Path]:
+        # Latest single-day response per date archived after `since`, for replaying the
+        # incremental runs that followed a full season fetch.
+        out: dict[str, Path] = {}
+        for params_path in sorted((self.root / endpoint).glob("*/params.json")):
+            params = (load_existing_json(params_path) or {}).get("params") or {}
+            day = str(params.get("DateFrom") or "")
+            if params.get("Season") != season or params.get("SeasonType") != season_type:
+                continue
+            if not day or day != params.get("DateTo"):
+                continue
+            latest = self.latest(endpoint, params, since=since)
+            if latest is not None:
+                out[datetime.strptime(day, "%m/%d/%Y").date().isoformat()] = latest
+        return out
+
+
+class ResponseSource:
+    # Where fetch tasks read upstream responses from: the live API (recorded into the archive
+    # when there is one), the archive alone for --from-archive, or archived copies written
+    # since `resume_since` when resuming an interrupted full build.
+
+    def __init__(self, archive: ResponseArchive | None, from_archive: bool = False, resume_since: str | None = None):
+        self.archive = archive
+        self.from_archive = from_archive
+        self.resume_since = resume_since
+        self.replayed = 0
+        self.requests: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def archived(self, endpoint: str, params: dict[str, Any]) -> Path | None:
+        if self.archive is None or not (self.from_archive or self.resume_since):
+            return None
+        return self.archive.latest(endpoint, params, since=None if self.from_archive else self.resume_since)
+
+    def offline(self, endpoint: str, params: dict[str, Any]) -> bool:
+        return self.from_archive or self.archived(endpoint, params) is not None
+
+    def open(self, endpoint: str, params: dict[str, Any]) -> Iterator[str]:
+        path = self.archived(endpoint, params)
+        if path is not None:
+            with self._lock:
+                self.replayed += 1
+            return ResponseArchive.replay(path)
+        if self.from_archive:
+            raise RuntimeError(f"no archived {endpoint} response for {json.dumps(params, sort_keys=True)}")
+        stats: dict[str, Any] = {
+            "endpoint": endpoint,
+            "season": params.get("Season"),
+            "season_type": params.get("SeasonType"),
+            "date": datetime.strptime(params["DateFrom"], "%m/%d/%Y").date().isoformat() if params.get("DateFrom") else None,
+        }
+        with self._lock:
+            self.requests.append(stats)
+        chunks = self._timed(fetch_chunks(endpoint, params, stats), stats)
+        return self.archive.record(endpoint, params, chunks) if self.archive else chunks
+
+    @staticmethod
+    def _timed(chunks: Iterator[str], stats: dict[str, Any]) -> Iterator[str]:
+        # Full-season responses are consumed while partitions are written, so `seconds` is the
+        # time from request to last chunk including that work; latency_seconds is upstream only.
+        started = time.monotonic()
+        try:
+            yield from chunks
         except Exception as err:
-            last_error = err
-            sleep_for = min(20, attempt * 4)
-            print(f"[warn] leaguegamelog failed {season} {season_type} attempt {attempt}/5: {err}", flush=True)
-            time.sleep(sleep_for)
-    if payload is None:
-        raise RuntimeError(f"leaguegamelog failed for {season} {season_type}: {last_error}")
+            stats["error"] = str(err)
+            raise
+        finally:
+            stats["seconds"] = round(time.monotonic() - started, 3)
 
-    rows = extract_rows(payload, "LeagueGameLog")
 
-    rows.sort(key=lambda r: (str(r.get("GAME_DATE") or ""), int(r.get("PLAYER_ID") or 0)))
-    stat_fields = infer_stat_fields(rows)
+def write_streamed_gamelogs(
+    root: Path, season: str, season_type: str, rows: Iterable[dict[str, Any]]
+) -> dict[str, Any]:
+    # Rows arrive in date order (sorter=DATE, ASC), so each week is written as soon as the next
+    # one starts. Per-player rows are spilled to JSON lines and turned into shards at the end.
+    spill_dir = root / "spill"
+    spill_dir.mkdir(parents=True, exist_ok=True)
+    partitions: list[dict[str, Any]] = []
+    week: str | None = None
+    week_rows: list[dict[str, Any]] = []
+    count = 0
+    peak_rss = current_rss_bytes()
+
+    def flush() -> None:
+        week_rows.sort(key=row_sort_key)
+        partitions.append(write_partition(root, season, season_type, week, week_rows))
+        by_player: dict[int, list[str]] = {}
+        for row in week_rows:
+            by_player.setdefault(int(row.get("PLAYER_ID") or 0), []).append(json.dumps(row, separators=(",", ":")))
+        for player_id, lines in by_player.items():
+            with open(spill_dir / f"{player_id}.jsonl", "a", encoding="utf-8") as fh:
+                fh.write("\n".join(lines) + "\n")
+
+    for row in rows:
+        if not row.get("GAME_DATE"):
+            continue
+        key = week_key(row["GAME_DATE"])
+        if key != week:
+            if week is not None and key < week:
+                raise RuntimeError(f"leaguegamelog rows for {season} {season_type} are not in date order")
+            if week_rows:
+                flush()
+            week = key
+            week_rows = []
+        week_rows.append(row)
+        count += 1
+        if count % 1000 == 0:
+            peak_rss = max(peak_rss, current_rss_bytes())
+    if week_rows:
+        flush()
+    peak_rss = max(peak_rss, current_rss_bytes())
+    write_gamelog_index(root, season, season_type, partitions)
 
+    (root / player_shard_dir_rel(season, season_type)).mkdir(parents=True, exist_ok=True)
+    for spill in spill_dir.glob("*.jsonl"):
+        with open(spill, encoding="utf-8") as fh:
+            player_rows = [json.loads(line) for line in fh]
+        write_player_shard(root, season, season_type, int(spill.stem), player_rows)
+    shutil.rmtree(spill_dir)
     return {
         "season": season,
         "season_type": season_type,
-        "count": len(rows),
-        "stat_fields": stat_fields,
-        "rows": rows,
+        "count": count,
+        "partitions": len(partitions),
+        "stat_fields": sorted({field for p in partitions for field in p.get("stat_fields", [])}),
+        "peak_rss_bytes": max(peak_rss, current_rss_bytes()),
     }
 
 
-def build_gamelogs_for_date(season: str, season_type: str, game_date: date) -> dict[str, Any]:
-    payload = None
-    last_error: Exception | None = None
-    date_mmddyyyy = game_date.strftime("%m/%d/%Y")
-    for attempt in range(1, 6):
+def same_file(a: Path, b: Path) -> bool:
+    # Hash-versioned names (and their .gz/.br copies) only ever hold one content.
+    name = a.name.removesuffix(".gz").removesuffix(".br")
+    if HASHED_NAME.match(name):
+        return True
+    return a.stat().st_size == b.stat().st_size and a.read_bytes() == b.read_bytes()
+
+
+def merge_staged_dir(staged: Path, final: Path, preserve: tuple[str, ...] = ()) -> dict[str, int]:
+    # Moves only new or changed files into place, then removes the ones the staged build no
+    # longer has, so unchanged partitions, shards and their .gz/.br keep their bytes and mtimes.
+    # Paths under `preserve` are written by later stages and left alone.
+    keep: set[str] = set()
+    replaced = 0
+    for path in staged.rglob("*"):
+        if not path.is_file():
+            continue
+        rel = path.relative_to(staged).as_posix()
+        keep.add(rel)
+        target = final / rel
+        if target.exists() and same_file(path, target):
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+        replaced += 1
+    removed = 0
+    if final.exists():
+        for path in list(final.rglob("*")):
+            rel = path.relative_to(final).as_posix()
+            if path.is_file() and rel not in keep and not rel.startswith(preserve):
+                path.unlink()
+                removed += 1
+    return {"files_replaced": replaced, "files_removed": removed}
+
+
+def build_gamelogs(
+    output_root: Path,
+    season: str,
+    season_type: str,
+    limiter: RateLimiter,
+    source: ResponseSource,
+    require_rows: bool = False,
+) -> dict[str, Any]:
+    # Streams the season into a staging directory and swaps it in only once it is complete.
+    slug = season_type_slug(season_type)
+    staging_root = output_root / ".staging" / f"{season}-{slug}"
+    endpoint, params = gamelog_request(season, season_type)
+    started = time.monotonic()
+
+    def stream() -> dict[str, Any]:
+        shutil.rmtree(staging_root, ignore_errors=True)
+        rows = iter_result_set_rows(source.open(endpoint, params), "LeagueGameLog")
+        return write_streamed_gamelogs(staging_root, season, season_type, rows)
+
+    try:
+        if source.offline(endpoint, params):
+            summary = stream()
+        else:
+            summary = call_with_retries(f"leaguegamelog {season} {season_type}", stream, limiter)
+        if require_rows and not summary["count"]:
+            raise RuntimeError(f"No LeagueGameLog rows returned for {season} {season_type}")
+        final_dir = output_root / gamelog_dir_rel(season, season_type)
+        staged_dir = staging_root / gamelog_dir_rel(season, season_type)
+        summary.update(merge_staged_dir(staged_dir, final_dir, preserve=("players.", "summaries")))
+        (output_root / legacy_gamelog_rel(season, season_type)).unlink(missing_ok=True)
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
         try:
-            endpoint = leaguegamelog.LeagueGameLog(
-                counter=0,
-                direction="ASC",
-                league_id="00",
-                player_or_team_abbreviation="P",
-                season=season,
-                season_type_all_star=season_type,
-                sorter="DATE",
-                date_from_nullable=date_mmddyyyy,
-                date_to_nullable=date_mmddyyyy,
-                timeout=90,
-                get_request=True,
-            )
-            payload = endpoint.get_dict()
-            break
-        except Exception as err:
-            last_error = err
-            sleep_for = min(20, attempt * 4)
-            print(
-                f"[warn] leaguegamelog date fetch failed {season} {season_type} {game_date.isoformat()} attempt {attempt}/5: {err}",
-                flush=True,
-            )
-            time.sleep(sleep_for)
-    if payload is None:
-        raise RuntimeError(f"leaguegamelog date fetch failed for {season} {season_type} {game_date.isoformat()}: {last_error}")
+            staging_root.parent.rmdir()
+        except OSError:
+            pass
+    summary["seconds"] = round(time.monotonic() - started, 3)
+    print(
+        f"[build] gamelogs {season} {season_type}: {summary['count']} rows in {summary['partitions']} partitions"
+        f" ({summary['files_replaced']} files written, {summary['files_removed']} removed),"
+        f" peak RSS {summary['peak_rss_bytes'] / (1 << 20):.1f} MB",
+        flush=True,
+    )
+    return summary
 
-    rows = extract_rows(payload, "LeagueGameLog")
+
+def build_gamelogs_for_date(
+    season: str, season_type: str, game_date: date, limiter: RateLimiter, source: ResponseSource
+) -> dict[str, Any]:
+    endpoint, params = gamelog_request(season, season_type, game_date)
+    started = time.monotonic()
+
+    def fetch() -> list[dict[str, Any]]:
+        return list(iter_result_set_rows(source.open(endpoint, params), "LeagueGameLog"))
+
+    if source.offline(endpoint, params):
+        rows = fetch()
+    else:
+        rows = call_with_retries(f"leaguegamelog {season} {season_type} {game_date.isoformat()}", fetch, limiter)
     rows.sort(key=lambda r: (str(r.get("GAME_DATE") or ""), int(r.get("PLAYER_ID") or 0)))
     return {
         "season": season,
@@ -181,6 +579,7 @@ def build_gamelogs_for_date(season: str, season_type: str, game_date: date) -> d
         "count": len(rows),
         "stat_fields": infer_stat_fields(rows),
         "rows": rows,
+        "seconds": round(time.monotonic() - started, 3),
     }
 
 
@@ -189,6 +588,144 @@ def dump_json(path: Path, data: dict[str, Any]) -> None:
     path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
 
 
+def encode_columnar(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    # One array per column. String columns become indexes into a per-column dictionary and
+    # ISO dates become days since 1970-01-01.
+    columns: list[str] = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    dictionaries: dict[str, list[str]] = {}
+    date_columns: list[str] = []
+    values: dict[str, list[Any]] = {}
+    for column in columns:
+        raw = [row.get(column) for row in rows]
+        present = [v for v in raw if v is not None]
+        if present and all(isinstance(v, str) for v in present):
+            if all(ISO_DATE.match(v) for v in present):
+                date_columns.append(column)
+                values[column] = [None if v is None else date.fromisoformat(v).toordinal() - EPOCH_ORDINAL for v in raw]
+                continue
+            lookup: dict[str, int] = {}
+            values[column] = [None if v is None else lookup.setdefault(v, len(lookup)) for v in raw]
+            dictionaries[column] = list(lookup)
+        else:
+            values[column] = raw
+    return {
+        "format": GAMELOG_FORMAT,
+        "columns": columns,
+        "dictionaries": dictionaries,
+        "date_columns": date_columns,
+        "values": values,
+    }
+
+
+def decode_rows(payload: dict[str, Any] | None) -> list[dict[str, Any]]:
+    if not payload:
+        return []
+    if payload.get("format") != GAMELOG_FORMAT:
+        return payload.get("rows", [])
+    columns = payload.get("columns", [])
+    dictionaries = payload.get("dictionaries", {})
+    date_columns = set(payload.get("date_columns", []))
+    decoded: list[list[Any]] = []
+    for column in columns:
+        raw = payload["values"][column]
+        if column in dictionaries:
+            lookup = dictionaries[column]
+            raw = [None if v is None else lookup[v] for v in raw]
+        elif column in date_columns:
+            raw = [None if v is None else date.fromordinal(v + EPOCH_ORDINAL).isoformat() for v in raw]
+        decoded.append(raw)
+    return [dict(zip(columns, values)) for values in zip(*decoded)]
+
+
+def versioned_rel(logical_rel: str, digest: str) -> str:
+    stem, _, suffix = logical_rel.rpartition(".")
+    return f"{stem}.{digest[:HASH_CHARS]}.{suffix}"
+
+
+def data_file_versions(output_root: Path, logical_rel: str) -> list[Path]:
+    # Hash-versioned copies of a logical file, plus the unversioned name older builds wrote.
+    path = output_root / logical_rel
+    out = [
+        candidate
+        for candidate in path.parent.glob(f"{path.stem}.*{path.suffix}")
+        if (match := HASHED_NAME.match(candidate.name)) and match["stem"] == path.stem
+    ]
+    if path.exists():
+        out.append(path)
+    return out
+
+
+def find_data_file(output_root: Path, logical_rel: str) -> Path | None:
+    versions = data_file_versions(output_root, logical_rel)
+    return max(versions, key=lambda p: p.stat().st_mtime_ns) if versions else None
+
+
+def data_file_entry(output_root: Path, path: Path, body: bytes | None = None, rows: int | None = None) -> dict[str, Any]:
+    if body is None:
+        body = path.read_bytes()
+    if rows is None:
+        rows = int(json.loads(body).get("count") or 0)
+    return {
+        "path": path.relative_to(output_root).as_posix(),
+        "sha256": hashlib.sha256(body).hexdigest(),
+        "bytes": len(body),
+        "rows": rows,
+    }
+
+
+def remove_gamelog_file(path: Path) -> None:
+    for candidate in (path, path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")):
+        candidate.unlink(missing_ok=True)
+
+
+def write_data_file(
+    output_root: Path, logical_rel: str, data: dict[str, Any], rows: int, compress: bool = False
+) -> dict[str, Any]:
+    # Files are named by content hash, so an existing name means identical bytes and the
+    # write is skipped. Other versions of the same logical file are removed.
+    body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()
+    path = output_root / versioned_rel(logical_rel, digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        path.write_bytes(body)
+    if compress:
+        gz_path = path.with_name(path.name + ".gz")
+        if not gz_path.exists():
+            gz_path.write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+        br_path = path.with_name(path.name + ".br")
+        if brotli is not None and not br_path.exists():
+            br_path.write_bytes(brotli.compress(body, quality=11))
+    for stale in data_file_versions(output_root, logical_rel):
+        if stale != path:
+            remove_gamelog_file(stale)
+    return data_file_entry(output_root, path, body, rows)
+
+
+def remove_data_file(output_root: Path, logical_rel: str) -> None:
+    for stale in data_file_versions(output_root, logical_rel):
+        remove_gamelog_file(stale)
+
+
+def read_gamelog_rows(path: Path | None) -> list[dict[str, Any]]:
+    return decode_rows(load_existing_json(path)) if path is not None else []
+
+
+def existing_data_file_entry(output_root: Path, logical_rel: str) -> dict[str, Any] | None:
+    path = find_data_file(output_root, logical_rel)
+    data = load_existing_json(path) if path is not None else None
+    if data is None:
+        return None
+    if not HASHED_NAME.match(path.name):
+        # Written before files were hash-versioned; move it to its hashed name.
+        return write_data_file(output_root, logical_rel, data, rows=int(data.get("count") or 0))
+    return data_file_entry(output_root, path)
+
+
 def parse_seasons(raw: str | None) -> list[str]:
     if not raw:
         return DEFAULT_SEASONS
@@ -203,17 +740,537 @@ def load_existing_json(path: Path) -> dict[str, Any] | None:
         return None
 
 
-def merge_rows_by_date(existing_rows: list[dict[str, Any]], date_rows: list[dict[str, Any]], target_date_iso: str) -> list[dict[str, Any]]:
-    # Remove target-date rows first, then add fresh rows, and dedupe by game/player.
-    base = [r for r in existing_rows if str(r.get("GAME_DATE") or "") != target_date_iso]
-    merged = base + date_rows
+def row_sort_key(row: dict[str, Any]) -> tuple[str, int]:
+    return (str(row.get("GAME_DATE") or ""), int(row.get("PLAYER_ID") or 0))
+
+
+def week_key(game_date: str) -> str:
+    # Partitions are keyed by the Monday of the game's week.
+    day = date.fromisoformat(str(game_date)[:10])
+    return date.fromordinal(day.toordinal() - day.weekday()).isoformat()
+
+
+def legacy_gamelog_rel(season: str, season_type: str) -> str:
+    return f"gamelogs/{season}/{season_type_slug(season_type)}.json"
+
+
+def gamelog_dir_rel(season: str, season_type: str) -> str:
+    return f"gamelogs/{season}/{season_type_slug(season_type)}"
+
+
+def gamelog_index_rel(season: str, season_type: str) -> str:
+    return f"{gamelog_dir_rel(season, season_type)}/index.json"
+
+
+def load_gamelog_index(output_root: Path, season: str, season_type: str) -> tuple[Path, dict[str, Any]] | None:
+    path = find_data_file(output_root, gamelog_index_rel(season, season_type))
+    index = load_existing_json(path) if path is not None else None
+    return (path, index) if index is not None else None
+
+
+def write_partition(output_root: Path, season: str, season_type: str, week: str, rows: list[dict[str, Any]]) -> dict[str, Any]:
+    stat_fields = infer_stat_fields(rows)
+    entry = write_data_file(
+        output_root,
+        f"{gamelog_dir_rel(season, season_type)}/{week}.json",
+        {
+            "season": season,
+            "season_type": season_type,
+            "week": week,
+            "count": len(rows),
+            "stat_fields": stat_fields,
+            **encode_columnar(rows),
+        },
+        rows=len(rows),
+        compress=True,
+    )
+    return {
+        "week": week,
+        **entry,
+        "format": GAMELOG_FORMAT,
+        "first_date": str(rows[0].get("GAME_DATE") or ""),
+        "last_date": str(rows[-1].get("GAME_DATE") or ""),
+        "stat_fields": stat_fields,
+    }
+
+
+def write_gamelog_index(output_root: Path, season: str, season_type: str, partitions: list[dict[str, Any]]) -> dict[str, Any]:
+    partitions = sorted(partitions, key=lambda p: p["week"])
+    count = sum(int(p["rows"]) for p in partitions)
+    return write_data_file(
+        output_root,
+        gamelog_index_rel(season, season_type),
+        {
+            "season": season,
+            "season_type": season_type,
+            "layout": GAMELOG_LAYOUT,
+            "count": count,
+            "stat_fields": sorted({field for p in partitions for field in p.get("stat_fields", [])}),
+            "partitions": partitions,
+        },
+        rows=count,
+    )
+
+
+def remove_stale_partitions(output_root: Path, season: str, season_type: str, keep: set[str]) -> None:
+    for candidate in (output_root / gamelog_dir_rel(season, season_type)).glob("*.json"):
+        if ISO_DATE.match(candidate.name[:10]) and candidate.relative_to(output_root).as_posix() not in keep:
+            remove_gamelog_file(candidate)
+
+
+def write_partitioned_gamelogs(output_root: Path, payload: dict[str, Any]) -> dict[str, Any]:
+    season = str(payload["season"])
+    season_type = str(payload["season_type"])
+    by_week: dict[str, list[dict[str, Any]]] = {}
+    for row in sorted(payload.get("rows", []), key=row_sort_key):
+        if row.get("GAME_DATE"):
+            by_week.setdefault(week_key(row["GAME_DATE"]), []).append(row)
+    partitions = [write_partition(output_root, season, season_type, week, rows) for week, rows in by_week.items()]
+    remove_stale_partitions(output_root, season, season_type, {p["path"] for p in partitions})
+    (output_root / legacy_gamelog_rel(season, season_type)).unlink(missing_ok=True)
+    return write_gamelog_index(output_root, season, season_type, partitions)
+
+
+def ensure_partitioned(output_root: Path, season: str, season_type: str) -> dict[str, Any] | None:
+    # Returns the partition index, converting a legacy single-file season on first use.
+    loaded = load_gamelog_index(output_root, season, season_type)
+    if loaded is not None:
+        _, index = loaded
+        if all(p.get("format") == GAMELOG_FORMAT and p.get("sha256") for p in index.get("partitions", [])):
+            return index
+        # Partitions from older builds (other encoding, no content hashes) are rewritten once.
+        print(f"[build] re-encoding gamelog {season} {season_type} as hashed {GAMELOG_FORMAT}", flush=True)
+        rows = [r for p in index.get("partitions", []) for r in read_gamelog_rows(output_root / p["path"])]
+        write_partitioned_gamelogs(output_root, {"season": season, "season_type": season_type, "rows": rows})
+        write_player_shards(output_root, season, season_type, rows)
+        return load_gamelog_index(output_root, season, season_type)[1]
+    legacy = load_existing_json(output_root / legacy_gamelog_rel(season, season_type))
+    if legacy is None:
+        return None
+    print(f"[build] partitioning legacy gamelog {season} {season_type}", flush=True)
+    legacy.setdefault("season", season)
+    legacy.setdefault("season_type", season_type)
+    write_partitioned_gamelogs(output_root, legacy)
+    return load_gamelog_index(output_root, season, season_type)[1]
+
+
+def gamelog_index_entry(output_root: Path, season: str, season_type: str) -> dict[str, Any] | None:
+    if ensure_partitioned(output_root, season, season_type) is None:
+        return None
+    return data_file_entry(output_root, load_gamelog_index(output_root, season, season_type)[0])
+
+
+def load_partitioned_gamelogs(output_root: Path, season: str, season_type: str) -> dict[str, Any] | None:
+    index = ensure_partitioned(output_root, season, season_type)
+    if index is None:
+        return None
+    rows: list[dict[str, Any]] = []
+    for partition in index.get("partitions", []):
+        rows.extend(read_gamelog_rows(output_root / partition["path"]))
+    return {
+        "season": season,
+        "season_type": season_type,
+        "count": len(rows),
+        "stat_fields": index.get("stat_fields", []),
+        "rows": rows,
+    }
+
+
+def merge_partition_rows(
+    existing_rows: list[dict[str, Any]], date_rows: dict[str, list[dict[str, Any]]]
+) -> list[dict[str, Any]]:
+    # Drop the refreshed dates, then add their fresh rows and dedupe by game/player.
+    kept = [r for r in existing_rows if str(r.get("GAME_DATE") or "")[:10] not in date_rows]
+    fresh = sorted((r for rows in date_rows.values() for r in rows), key=row_sort_key)
+    # Nightly refreshes cover the latest dates, so fresh rows normally just append.
+    if kept and fresh and row_sort_key(kept[-1]) > row_sort_key(fresh[0]):
+        merged = sorted(kept + fresh, key=row_sort_key)
+    else:
+        merged = kept + fresh
     deduped: dict[tuple[str, int], dict[str, Any]] = {}
     for r in merged:
-        key = (str(r.get("GAME_ID") or ""), int(r.get("PLAYER_ID") or 0))
-        deduped[key] = r
-    rows = list(deduped.values())
-    rows.sort(key=lambda r: (str(r.get("GAME_DATE") or ""), int(r.get("PLAYER_ID") or 0)))
-    return rows
+        deduped[(str(r.get("GAME_ID") or ""), int(r.get("PLAYER_ID") or 0))] = r
+    return list(deduped.values())
+
+
+def date_row_changes(old_rows: list[dict[str, Any]], new_rows: list[dict[str, Any]]) -> dict[str, int]:
+    def keyed(rows: list[dict[str, Any]]) -> dict[tuple[str, int], dict[str, Any]]:
+        return {(str(r.get("GAME_ID") or ""), int(r.get("PLAYER_ID") or 0)): r for r in rows}
+
+    old, new = keyed(old_rows), keyed(new_rows)
+    return {
+        "rows": len(new),
+        "added": sum(1 for key in new if key not in old),
+        "changed": sum(1 for key, row in new.items() if key in old and old[key] != row),
+        "removed": sum(1 for key in old if key not in new),
+    }
+
+
+def apply_date_rows(
+    output_root: Path, season: str, season_type: str, date_rows: dict[str, list[dict[str, Any]]]
+) -> tuple[dict[str, Any], set[int], dict[str, dict[str, int]]]:
+    # Rewrites only the week partitions that contain a refreshed date. Also returns the players
+    # whose rows changed (fresh rows, or rows that were on a refreshed date before) and the
+    # added/changed/removed row counts per date.
+    index = ensure_partitioned(output_root, season, season_type)
+    if index is None:
+        raise RuntimeError(f"Missing existing gamelogs for incremental update: {season} {season_type}")
+    partitions = {p["week"]: p for p in index.get("partitions", [])}
+
+    by_week: dict[str, dict[str, list[dict[str, Any]]]] = {}
+    for day_iso, rows in date_rows.items():
+        by_week.setdefault(week_key(day_iso), {})[day_iso] = rows
+
+    touched = {int(r.get("PLAYER_ID") or 0) for rows in date_rows.values() for r in rows}
+    changes: dict[str, dict[str, int]] = {}
+    for week, week_dates in sorted(by_week.items()):
+        current = partitions.get(week)
+        existing_rows = read_gamelog_rows(output_root / current["path"]) if current else []
+        touched.update(
+            int(r.get("PLAYER_ID") or 0) for r in existing_rows if str(r.get("GAME_DATE") or "")[:10] in week_dates
+        )
+        for day_iso, fresh in week_dates.items():
+            previous = [r for r in existing_rows if str(r.get("GAME_DATE") or "")[:10] == day_iso]
+            changes[day_iso] = date_row_changes(previous, fresh)
+        rows = merge_partition_rows(existing_rows, week_dates)
+        if rows:
+            partitions[week] = write_partition(output_root, season, season_type, week, rows)
+        elif current:
+            remove_data_file(output_root, f"{gamelog_dir_rel(season, season_type)}/{week}.json")
+            del partitions[week]
+    return write_gamelog_index(output_root, season, season_type, list(partitions.values())), touched, dict(sorted(changes.items()))
+
+
+def player_shard_dir_rel(season: str, season_type: str) -> str:
+    return f"{gamelog_dir_rel(season, season_type)}/players"
+
+
+def player_shard_index_rel(season: str, season_type: str) -> str:
+    return f"{gamelog_dir_rel(season, season_type)}/players.json"
+
+
+def write_player_shard(output_root: Path, season: str, season_type: str, player_id: int, rows: list[dict[str, Any]]) -> None:
+    logical_rel = f"{player_shard_dir_rel(season, season_type)}/{player_id}.json"
+    if not rows:
+        remove_data_file(output_root, logical_rel)
+        return
+    write_data_file(
+        output_root,
+        logical_rel,
+        {
+            "season": season,
+            "season_type": season_type,
+            "player_id": player_id,
+            "count": len(rows),
+            "stat_fields": infer_stat_fields(rows),
+            **encode_columnar(rows),
+        },
+        rows=len(rows),
+        compress=True,
+    )
+
+
+def write_player_shards(output_root: Path, season: str, season_type: str, rows: list[dict[str, Any]]) -> None:
+    by_player: dict[int, list[dict[str, Any]]] = {}
+    for row in sorted(rows, key=row_sort_key):
+        try:
+            by_player.setdefault(int(row.get("PLAYER_ID")), []).append(row)
+        except (TypeError, ValueError):
+            continue
+    shard_dir = output_root / player_shard_dir_rel(season, season_type)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for stale in shard_dir.glob("*.json"):
+        player_id = stale.name.split(".", 1)[0]
+        if not player_id.isdigit() or int(player_id) not in by_player:
+            remove_gamelog_file(stale)
+    for player_id, player_rows in by_player.items():
+        write_player_shard(output_root, season, season_type, player_id, player_rows)
+
+
+def update_player_shards(
+    output_root: Path,
+    season: str,
+    season_type: str,
+    date_rows: dict[str, list[dict[str, Any]]],
+    player_ids: set[int],
+) -> None:
+    shard_dir_rel = player_shard_dir_rel(season, season_type)
+    for player_id in sorted(player_ids):
+        shard_rows = read_gamelog_rows(find_data_file(output_root, f"{shard_dir_rel}/{player_id}.json"))
+        player_dates = {
+            day_iso: [r for r in rows if int(r.get("PLAYER_ID") or 0) == player_id]
+            for day_iso, rows in date_rows.items()
+        }
+        rows = merge_partition_rows(shard_rows, player_dates)
+        write_player_shard(output_root, season, season_type, player_id, rows)
+
+
+def ensure_player_shards(output_root: Path, season: str, season_type: str) -> bool:
+    # Shards are derived from the partitions, so a season built before sharding gets them here.
+    if (output_root / player_shard_dir_rel(season, season_type)).is_dir():
+        return True
+    payload = load_partitioned_gamelogs(output_root, season, season_type)
+    if payload is None:
+        return False
+    print(f"[build] player shards {season} {season_type}", flush=True)
+    write_player_shards(output_root, season, season_type, payload["rows"])
+    return True
+
+
+def shard_payloads(output_root: Path, season: str) -> Iterator[dict[str, Any]]:
+    for season_type in SEASON_TYPES:
+        for shard in sorted((output_root / player_shard_dir_rel(season, season_type)).glob("*.json")):
+            yield {"rows": read_gamelog_rows(shard)}
+
+
+def write_player_shard_index(output_root: Path, season: str, season_type: str) -> dict[str, Any]:
+    # The per-player index lives in its own hashed file so the manifest stays small; entries for
+    # shards whose hashed name did not change are carried over without re-reading them.
+    previous_path = find_data_file(output_root, player_shard_index_rel(season, season_type))
+    previous = (load_existing_json(previous_path) or {}).get("players", {}) if previous_path else {}
+    previous_by_path = {entry["path"]: entry for entry in previous.values() if isinstance(entry, dict)}
+    players: dict[str, dict[str, Any]] = {}
+    for shard in (output_root / player_shard_dir_rel(season, season_type)).glob("*.json"):
+        player_id = shard.name.split(".", 1)[0]
+        if not player_id.isdigit():
+            continue
+        rel = shard.relative_to(output_root).as_posix()
+        players[player_id] = previous_by_path.get(rel) or data_file_entry(output_root, shard)
+    players = dict(sorted(players.items(), key=lambda item: int(item[0])))
+    return write_data_file(
+        output_root,
+        player_shard_index_rel(season, season_type),
+        {
+            "season": season,
+            "season_type": season_type,
+            "format": GAMELOG_FORMAT,
+            "count": len(players),
+            "players": players,
+        },
+        rows=len(players),
+    )
+
+
+def player_summary_dir_rel(season: str, season_type: str) -> str:
+    return f"{gamelog_dir_rel(season, season_type)}/summaries"
+
+
+def player_summary_index_rel(season: str, season_type: str) -> str:
+    return f"{gamelog_dir_rel(season, season_type)}/summaries.json"
+
+
+def summary_values(frame: pd.DataFrame, digits: int) -> list[list[float | None]]:
+    rounded = frame.round(digits).astype(object)
+    return rounded.where(frame.notna(), None).values.tolist()
+
+
+def summarize_players(frame: pd.DataFrame, stats: list[str]) -> dict[str, Any]:
+    # One grouped pass per aggregate over the whole season type. Rolling means use the same
+    # partial-window rule as the trend chart, so "last 5" means the mean of up to 5 games.
+    frame = frame.sort_values(["PLAYER_ID", "GAME_DATE"], kind="stable")
+    grouped = frame.groupby("PLAYER_ID", sort=True)
+    games = grouped.size()
+    averages = grouped[stats].mean()
+    rolling = {
+        f"last{window}": frame.groupby("PLAYER_ID").tail(window).groupby("PLAYER_ID", sort=True)[stats].mean()
+        for window in SUMMARY_WINDOWS
+    }
+    ewma = grouped[stats].ewm(span=SUMMARY_EWMA_SPAN).mean().groupby(level=0).last()
+    # League percentiles of the season average, among players with enough games to qualify.
+    qualified = games >= min(SUMMARY_MIN_GAMES, int(games.max()))
+    percentiles = averages[qualified].rank(pct=True).mul(100).reindex(averages.index)
+    last_dates = grouped["GAME_DATE"].max()
+    metrics = {
+        "avg": summary_values(averages, 3),
+        **{name: summary_values(values.reindex(averages.index), 3) for name, values in rolling.items()},
+        "ewma": summary_values(ewma.reindex(averages.index), 3),
+        "pct": summary_values(percentiles, 1),
+    }
+    players: dict[str, dict[str, Any]] = {}
+    for position, player_id in enumerate(averages.index):
+        players[str(int(player_id))] = {
+            "games": int(games[player_id]),
+            "last_date": str(last_dates[player_id]),
+            **{name: values[position] for name, values in metrics.items()},
+        }
+    return players
+
+
+def write_player_summaries(output_root: Path, season: str, season_type: str) -> dict[str, Any] | None:
+    # One small hashed file per player, so the app only downloads the player it shows. The
+    # index maps player ids to content hashes; percentiles are league-wide, so every file is
+    # recomputed, but unchanged ones keep their names and are not rewritten.
+    located = load_gamelog_index(output_root, season, season_type)
+    if located is None:
+        return None
+    _, index = located
+    stats = [field for field in index.get("stat_fields", []) if field not in SUMMARY_SKIP_FIELDS]
+    columns = ["PLAYER_ID", "GAME_DATE", *stats]
+    # Only the summarized columns are kept from each partition.
+    frames = [
+        pd.DataFrame.from_records(read_gamelog_rows(output_root / partition["path"]), columns=columns)
+        for partition in index.get("partitions", [])
+    ]
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    frame["PLAYER_ID"] = pd.to_numeric(frame["PLAYER_ID"], errors="coerce")
+    frame = frame.dropna(subset=["PLAYER_ID"])
+    frame[stats] = frame[stats].apply(pd.to_numeric, errors="coerce")
+    players = summarize_players(frame, stats) if len(frame) else {}
+
+    summary_dir_rel = player_summary_dir_rel(season, season_type)
+    summary_dir = output_root / summary_dir_rel
+    summary_dir.mkdir(parents=True, exist_ok=True)
+    for stale in summary_dir.glob("*.json"):
+        player_id = stale.name.split(".", 1)[0]
+        if not player_id.isdigit() or player_id not in players:
+            remove_gamelog_file(stale)
+    hashes: dict[str, str] = {}
+    for player_id, summary in players.items():
+        entry = write_data_file(
+            output_root,
+            f"{summary_dir_rel}/{player_id}.json",
+            {
+                "season": season,
+                "season_type": season_type,
+                "player_id": int(player_id),
+                "stats": stats,
+                "windows": SUMMARY_WINDOWS,
+                "ewma_span": SUMMARY_EWMA_SPAN,
+                **summary,
+            },
+            rows=1,
+        )
+        hashes[player_id] = HASHED_NAME.match(Path(entry["path"]).name)["digest"]
+    # Summaries from before they were split per player.
+    remove_data_file(output_root, f"{gamelog_dir_rel(season, season_type)}/summary.json")
+    return write_data_file(
+        output_root,
+        player_summary_index_rel(season, season_type),
+        {
+            "season": season,
+            "season_type": season_type,
+            "dir": summary_dir_rel,
+            "count": len(hashes),
+            "players": hashes,
+        },
+        rows=len(hashes),
+        compress=True,
+    )
+
+
+def replay_archived_dates(output_root: Path, archive: ResponseArchive, season: str, season_type: str) -> int:
+    # A --from-archive rebuild starts from the newest full-season response; the daily
+    # responses archived after it are applied on top, as the incremental runs did.
+    endpoint, params = gamelog_request(season, season_type)
+    full = archive.latest(endpoint, params)
+    if full is None:
+        return 0
+    fetches = archive.date_fetches(endpoint, season, season_type, since=full.name)
+    if not fetches:
+        return 0
+    date_rows = {
+        day_iso: sorted(iter_result_set_rows(ResponseArchive.replay(path), "LeagueGameLog"), key=row_sort_key)
+        for day_iso, path in sorted(fetches.items())
+    }
+    _, touched, _ = apply_date_rows(output_root, season, season_type, date_rows)
+    update_player_shards(output_root, season, season_type, date_rows, touched)
+    print(f"[build] replayed {len(fetches)} archived daily fetches for {season} {season_type}", flush=True)
+    return len(fetches)
+
+
+def start_full_run(archive: ResponseArchive, resume: bool) -> str:
+    # Marks the start of a full build. With --resume after an interrupted one, the earlier
+    # start is kept so every response archived since then is reused instead of refetched.
+    state_path = archive.root / "full-build.json"
+    state = load_existing_json(state_path) or {}
+    if resume and state.get("started_at") and not state.get("completed"):
+        started_at = str(state["started_at"])
+        print(f"[build] resuming full build started {started_at}", flush=True)
+    else:
+        if resume:
+            print("[warn] no interrupted full build to resume; starting over", flush=True)
+        started_at = archive_stamp()
+    dump_json(state_path, {"started_at": started_at, "completed": False})
+    return started_at
+
+
+def finish_full_run(archive: ResponseArchive, started_at: str) -> None:
+    dump_json(archive.root / "full-build.json", {"started_at": started_at, "completed": True})
+
+
+def record_stage(stages: list[dict[str, Any]], stage: str, started: float, **labels: Any) -> dict[str, Any]:
+    entry = {"stage": stage, **labels, "seconds": round(time.monotonic() - started, 3)}
+    stages.append(entry)
+    return entry
+
+
+def output_snapshot(output_root: Path) -> dict[str, tuple[int, int]]:
+    out = {}
+    if not output_root.exists():
+        return out
+    for path in output_root.rglob("*"):
+        rel = path.relative_to(output_root).as_posix()
+        if rel.startswith(".staging/") or rel == REPORT_NAME or not path.is_file():
+            continue
+        stat = path.stat()
+        out[rel] = (stat.st_size, stat.st_mtime_ns)
+    return out
+
+
+def output_changes(before: dict[str, tuple[int, int]], after: dict[str, tuple[int, int]]) -> dict[str, Any]:
+    # Data files are content-hashed, so a written file is new content and a removed one is a
+    # replaced version; an incremental run that changed nothing writes and removes nothing.
+    written = [rel for rel, meta in after.items() if before.get(rel) != meta]
+    removed = [rel for rel in before if rel not in after]
+    families: dict[str, dict[str, int]] = {}
+    for rel, (size, _) in after.items():
+        family = families.setdefault(rel.split("/", 1)[0] if "/" in rel else rel, {"files": 0, "bytes": 0, "compressed_bytes": 0})
+        if rel.endswith((".gz", ".br")):
+            family["compressed_bytes"] += size
+        else:
+            family["files"] += 1
+            family["bytes"] += size
+    return {
+        "files_written": len(written),
+        "bytes_written": sum(after[rel][0] for rel in written),
+        "files_removed": len(removed),
+        "bytes_removed": sum(before[rel][0] for rel in removed),
+        "total_files": len(after),
+        "total_bytes": sum(size for size, _ in after.values()),
+        "by_family": dict(sorted(families.items())),
+    }
+
+
+def latency_summary(values: list[float]) -> dict[str, float] | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def pct(q: float) -> float:
+        return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+    return {
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": pct(0.5),
+        "p95": pct(0.95),
+        "max": ordered[-1],
+    }
+
+
+def upstream_report(limiter: RateLimiter, source: ResponseSource) -> dict[str, Any]:
+    requests_made = list(source.requests)
+    return {
+        "attempts": limiter.calls,
+        "retries": limiter.retries,
+        "rate_limit_wait_seconds": round(limiter.waited_seconds, 3),
+        "backoff_seconds": round(limiter.backoff_seconds, 3),
+        "replayed_from_archive": source.replayed,
+        "requests": len(requests_made),
+        "failed": sum(1 for r in requests_made if "error" in r),
+        "bytes": sum(int(r.get("bytes") or 0) for r in requests_made),
+        "latency_seconds": latency_summary([r["latency_seconds"] for r in requests_made if "latency_seconds" in r]),
+        "by_request": requests_made,
+    }
 
 
 def main() -> None:
@@ -232,6 +1289,39 @@ def main() -> None:
         default=int(os.getenv("INCREMENTAL_DAYS", "1")),
         help="Number of days (ending at incremental-date) to refresh in incremental mode",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("BUILD_WORKERS", "4")),
+        help="Concurrent upstream fetches",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=float(os.getenv("UPSTREAM_MIN_INTERVAL_SECONDS", "0.6")),
+        help="Minimum seconds between upstream calls across all workers",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=os.getenv("UPSTREAM_ARCHIVE_DIR", ".archive/upstream"),
+        help="Directory for gzip copies of raw upstream responses (empty to disable)",
+    )
+    parser.add_argument(
+        "--archive-keep",
+        type=int,
+        default=int(os.getenv("UPSTREAM_ARCHIVE_KEEP", "3")),
+        help="Archived responses kept per endpoint and parameter set",
+    )
+    parser.add_argument(
+        "--from-archive",
+        action="store_true",
+        help="Rebuild every output from archived responses without calling upstream",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse responses archived by an interrupted full build instead of refetching them",
+    )
     args = parser.parse_args()
 
     seasons = parse_seasons(args.seasons)
@@ -240,81 +1330,192 @@ def main() -> None:
     if args.incremental_date:
         incremental_date = date.fromisoformat(args.incremental_date)
     incremental_days = max(1, int(args.incremental_days))
+    started = time.monotonic()
+    started_at = datetime.now(timezone.utc)
+    before = output_snapshot(output_root)
+    stages: list[dict[str, Any]] = []
+    rows_report: dict[str, dict[str, Any]] = {}
+    limiter = RateLimiter(args.min_interval)
+    archive = ResponseArchive(Path(args.archive_dir).resolve(), args.archive_keep) if args.archive_dir else None
+    if (args.from_archive or args.resume) and archive is None:
+        parser.error("--from-archive and --resume need --archive-dir")
+    full_run = None
+    if archive is not None and not incremental_date and not args.from_archive:
+        full_run = start_full_run(archive, args.resume)
+    source = ResponseSource(archive, from_archive=args.from_archive, resume_since=full_run if args.resume else None)
+    pool = ThreadPoolExecutor(max_workers=max(1, args.workers))
+
+    # Every upstream fetch is queued up front; results are merged below in season order.
+    full_jobs = {}
+    date_jobs = {}
+    for season in seasons:
+        if incremental_date and season != args.default_season:
+            continue
+        for season_type in SEASON_TYPES:
+            if incremental_date:
+                for offset in range(incremental_days):
+                    target = date.fromordinal(incremental_date.toordinal() - offset)
+                    date_jobs[(season, season_type, target)] = pool.submit(
+                        build_gamelogs_for_date, season, season_type, target, limiter, source
+                    )
+            else:
+                require_rows = season == args.default_season and season_type == "Regular Season"
+                full_jobs[(season, season_type)] = pool.submit(
+                    build_gamelogs, output_root, season, season_type, limiter, source, require_rows
+                )
+    pool.shutdown(wait=False)
 
-    files_players: dict[str, str] = {}
-    files_gamelogs: dict[str, dict[str, str]] = {}
+    files_players: dict[str, dict[str, Any]] = {}
+    files_gamelogs: dict[str, dict[str, dict[str, Any]]] = {}
+    files_player_gamelogs: dict[str, dict[str, dict[str, Any]]] = {}
+    files_player_summaries: dict[str, dict[str, dict[str, Any]]] = {}
 
     for season in seasons:
+        players_rel = f"players/{season}.json"
+        files_gamelogs[season] = {}
+        files_player_gamelogs[season] = {}
+        files_player_summaries[season] = {}
+        rows_report[season] = {}
+        stage_started = time.monotonic()
         if incremental_date and season != args.default_season:
             # In incremental mode, only refresh current season.
-            players_rel = f"players/{season}.json"
-            files_players[season] = players_rel
-            files_gamelogs[season] = {}
+            players_entry = existing_data_file_entry(output_root, players_rel)
+            if players_entry is not None:
+                files_players[season] = players_entry
             for season_type in SEASON_TYPES:
-                files_gamelogs[season][season_type_slug(season_type)] = f"gamelogs/{season}/{season_type_slug(season_type)}.json"
+                slug = season_type_slug(season_type)
+                index_entry = gamelog_index_entry(output_root, season, season_type)
+                if index_entry is not None:
+                    files_gamelogs[season][slug] = index_entry
+                if ensure_player_shards(output_root, season, season_type):
+                    files_player_gamelogs[season][slug] = write_player_shard_index(output_root, season, season_type)
+                summary_entry = existing_data_file_entry(
+                    output_root, player_summary_index_rel(season, season_type)
+                ) or write_player_summaries(output_root, season, season_type)
+                if summary_entry is not None:
+                    files_player_summaries[season][slug] = summary_entry
+            record_stage(stages, "reuse", stage_started, season=season)
             continue
 
-        files_gamelogs[season] = {}
         season_gamelog_payloads: list[dict[str, Any]] = []
         for season_type in SEASON_TYPES:
             slug = season_type_slug(season_type)
             print(f"[build] gamelogs {season} {season_type}", flush=True)
-            rel = f"gamelogs/{season}/{slug}.json"
-            out_path = output_root / rel
+            stage_started = time.monotonic()
+            stage: dict[str, Any] = {}
             gamelog_payload = None
             try:
                 if incremental_date and season == args.default_season:
-                    existing = load_existing_json(out_path)
-                    if existing is None:
-                        raise RuntimeError(f"Missing existing file for incremental update: {out_path}")
-                    merged_rows = existing.get("rows", [])
+                    date_rows: dict[str, list[dict[str, Any]]] = {}
+                    fetch_seconds = 0.0
                     for offset in range(incremental_days):
                         target = date.fromordinal(incremental_date.toordinal() - offset)
-                        date_payload = build_gamelogs_for_date(season, season_type, target)
-                        target_iso = target.isoformat()
-                        merged_rows = merge_rows_by_date(merged_rows, date_payload.get("rows", []), target_iso)
-                    gamelog_payload = {
-                        "season": season,
-                        "season_type": season_type,
-                        "count": len(merged_rows),
-                        "stat_fields": infer_stat_fields(merged_rows),
-                        "rows": merged_rows,
-                    }
-                    dump_json(out_path, gamelog_payload)
+                        result = date_jobs[(season, season_type, target)].result()
+                        date_rows[target.isoformat()] = result.get("rows", [])
+                        fetch_seconds += result["seconds"]
+                    index_entry, touched, date_changes = apply_date_rows(output_root, season, season_type, date_rows)
+                    stage = {"fetch_seconds": round(fetch_seconds, 3), "players_touched": len(touched)}
+                    rows_report[season][slug] = {"dates": date_changes}
+                    if not ensure_player_shards(output_root, season, season_type):
+                        raise RuntimeError(f"Missing player shards for {season} {season_type}")
+                    update_player_shards(output_root, season, season_type, date_rows, touched)
+                    fresh_rows = sorted((r for rows in date_rows.values() for r in rows), key=row_sort_key)
+                    gamelog_payload = {"rows": fresh_rows}
                 else:
-                    gamelog_payload = build_gamelogs(season, season_type)
-                    if season == args.default_season and season_type == "Regular Season" and int(gamelog_payload["count"]) == 0:
-                        raise RuntimeError(f"No LeagueGameLog rows returned for {season} {season_type}")
-                    dump_json(out_path, gamelog_payload)
+                    summary = full_jobs[(season, season_type)].result()
+                    stage = {"fetch_seconds": summary["seconds"], "peak_rss_bytes": summary["peak_rss_bytes"]}
+                    rows_report[season][slug] = {"rows": summary["count"], "partitions": summary["partitions"]}
+                    if args.from_archive:
+                        replay_archived_dates(output_root, archive, season, season_type)
+                    index_entry = gamelog_index_entry(output_root, season, season_type)
+                    gamelog_payload = {"rows": []}
             except Exception as err:
-                existing = load_existing_json(out_path)
-                if existing is None:
+                index_entry = gamelog_index_entry(output_root, season, season_type)
+                if index_entry is None:
                     raise RuntimeError(f"Failed to refresh {season} {season_type} and no cached file exists: {err}") from err
                 print(f"[warn] using cached gamelog for {season} {season_type}: {err}", flush=True)
-                gamelog_payload = existing
+                ensure_player_shards(output_root, season, season_type)
+                gamelog_payload = {"rows": []}
+                stage = {"error": str(err), "used_cached": True}
 
-            files_gamelogs[season][slug] = rel
+            files_gamelogs[season][slug] = index_entry
+            files_player_gamelogs[season][slug] = write_player_shard_index(output_root, season, season_type)
+            record_stage(stages, "gamelogs", stage_started, season=season, season_type=season_type, **stage)
+            print(f"[build] player summaries {season} {season_type}", flush=True)
+            stage_started = time.monotonic()
+            summary_entry = write_player_summaries(output_root, season, season_type)
+            if summary_entry is not None:
+                files_player_summaries[season][slug] = summary_entry
+            record_stage(stages, "player_summaries", stage_started, season=season, season_type=season_type)
             season_gamelog_payloads.append(gamelog_payload)
-            time.sleep(1.5)
 
         print(f"[build] players {season}", flush=True)
-        players_payload = build_players_from_gamelogs(season, season_gamelog_payloads)
-        players_rel = f"players/{season}.json"
-        dump_json(output_root / players_rel, players_payload)
-        files_players[season] = players_rel
+        stage_started = time.monotonic()
+        players_path = find_data_file(output_root, players_rel) if incremental_date else None
+        existing_players = load_existing_json(players_path) if players_path is not None else None
+        if existing_players is None:
+            # Full builds (and incremental runs without a players file) read the shards one at a time.
+            season_gamelog_payloads = shard_payloads(output_root, season)
+        players_payload = build_players_from_gamelogs(season, season_gamelog_payloads, existing_players)
+        files_players[season] = write_data_file(
+            output_root, players_rel, players_payload, rows=int(players_payload["count"])
+        )
+        record_stage(stages, "players", stage_started, season=season, players=int(players_payload["count"]))
 
     manifest = {
-        "generated_at": datetime.now(timezone.utc).isoformat(),
         "default_season": args.default_season if args.default_season in seasons else seasons[0],
         "seasons": seasons,
         "season_types": SEASON_TYPES,
+        "gamelog_layout": GAMELOG_LAYOUT,
+        "gamelog_format": GAMELOG_FORMAT,
         "files": {
             "players": files_players,
             "gamelogs": files_gamelogs,
+            "player_gamelogs": files_player_gamelogs,
+            "player_summaries": files_player_summaries,
         },
     }
-    dump_json(output_root / "manifest.json", manifest)
-    print("[build] done", flush=True)
+    # Only the manifest keeps a fixed name. It is rewritten (with a new generated_at) only when
+    # something it points at changed, so a no-op nightly run leaves the tree untouched.
+    previous = load_existing_json(output_root / "manifest.json") or {}
+    previous.pop("generated_at", None)
+    manifest_changed = previous != manifest
+    if not manifest_changed:
+        print("[build] manifest unchanged", flush=True)
+    else:
+        dump_json(output_root / "manifest.json", {"generated_at": datetime.now(timezone.utc).isoformat(), **manifest})
+    if full_run is not None:
+        finish_full_run(archive, full_run)
+
+    # Machine-readable account of this run, next to the manifest. It is rewritten on every run,
+    # unlike the data files, so it is not part of what decides whether the data changed.
+    outputs = output_changes(before, output_snapshot(output_root))
+    dump_json(
+        output_root / REPORT_NAME,
+        {
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "wall_seconds": round(time.monotonic() - started, 3),
+            "mode": "from-archive" if args.from_archive else "incremental" if incremental_date else "full",
+            "incremental_date": incremental_date.isoformat() if incremental_date else None,
+            "incremental_days": incremental_days if incremental_date else None,
+            "seasons": seasons,
+            "workers": max(1, args.workers),
+            "min_interval_seconds": args.min_interval,
+            "stages": stages,
+            "upstream": upstream_report(limiter, source),
+            "rows": rows_report,
+            "outputs": {"manifest_changed": manifest_changed, **outputs},
+            "peak_rss_bytes": peak_rss_bytes(),
+        },
+    )
+    print(
+        f"[build] done in {time.monotonic() - started:.1f}s: {limiter.calls} upstream calls,"
+        f" {limiter.retries} retries, {source.replayed} replayed from archive,"
+        f" {len(full_jobs) + len(date_jobs)} fetch tasks, {max(1, args.workers)} workers,"
+        f" {outputs['files_written']} files written, peak RSS {peak_rss_bytes() / (1 << 20):.1f} MB",
+        flush=True,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from nba_api.stats.endpoints import leaguedashptstats
+
+from build_static_data import SEASON_TYPES, RateLimiter, call_with_retries, extract_rows
+
+DEFAULT_MEASURES = [
+    "Passing",
+    "Rebounding",
+    "Possessions",
+    "Drives",
+    "CatchShoot",
+    "PullUpShot",
+    "Defense",
+    "Efficiency",
+    "SpeedDistance",
+    "ElbowTouch",
+    "PostTouch",
+    "PaintTouch",
+]
+
+
+def season_window(season: str, season_type: str) -> tuple[date, date]:
+    start_year = int(season[:4])
+    if season_type == "Playoffs":
+        return date(start_year + 1, 4, 10), date(start_year + 1, 7, 1)
+    return date(start_year, 10, 1), date(start_year + 1, 4, 20)
+
+
+def open_warehouse(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS tracking (
+            season_type TEXT NOT NULL,
+            measure TEXT NOT NULL,
+            game_date TEXT NOT NULL,
+            player_id INTEGER NOT NULL,
+            row TEXT NOT NULL,
+            PRIMARY KEY (player_id, measure, season_type, game_date)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS ingest_log (
+            season_type TEXT NOT NULL,
+            measure TEXT NOT NULL,
+            game_date TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            fetched_at TEXT NOT NULL,
+            PRIMARY KEY (season_type, measure, game_date)
+        );
+        """
+    )
+    return conn
+
+
+def fetch_tracking_day(
+    season: str, season_type: str, measure: str, day: date, limiter: RateLimiter
+) -> list[dict[str, Any]]:
+    date_mmddyyyy = day.strftime("%m/%d/%Y")
+
+    def fetch() -> dict[str, Any]:
+        endpoint = leaguedashptstats.LeagueDashPtStats(
+            season=season,
+            season_type_all_star=season_type,
+            per_mode_simple="PerGame",
+            player_or_team="Player",
+            pt_measure_type=measure,
+            date_from_nullable=date_mmddyyyy,
+            date_to_nullable=date_mmddyyyy,
+            timeout=90,
+        )
+        return endpoint.get_dict()
+
+    label = f"leaguedashptstats {season} {season_type} {measure} {day.isoformat()}"
+    return extract_rows(call_with_retries(label, fetch, limiter))
+
+
+def ingest_day(
+    conn: sqlite3.Connection,
+    season: str,
+    season_type: str,
+    measure: str,
+    day: date,
+    limiter: RateLimiter,
+) -> int:
+    rows = fetch_tracking_day(season, season_type, measure, day, limiter)
+    day_iso = day.isoformat()
+    records = []
+    for row in rows:
+        try:
+            player_id = int(row.get("PLAYER_ID"))
+        except (TypeError, ValueError):
+            continue
+        records.append((season_type, measure, day_iso, player_id, json.dumps(row, separators=(",", ":"))))
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "DELETE FROM tracking WHERE season_type = ? AND measure = ? AND game_date = ?",
+            (season_type, measure, day_iso),
+        )
+        conn.executemany("INSERT INTO tracking VALUES (?, ?, ?, ?, ?)", records)
+        conn.execute(
+            "INSERT OR REPLACE INTO ingest_log VALUES (?, ?, ?, ?, ?)",
+            (season_type, measure, day_iso, len(records), datetime.now(timezone.utc).isoformat()),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return len(records)
+
+
+def target_days(season: str, season_type: str, end: date, days: int, backfill: bool) -> list[date]:
+    window_start, window_end = season_window(season, season_type)
+    last = min(end, window_end)
+    first = window_start if backfill else max(window_start, last - timedelta(days=days - 1))
+    out = []
+    cursor = first
+    while cursor <= last:
+        out.append(cursor)
+        cursor += timedelta(days=1)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest daily league-wide tracking snapshots into a per-season warehouse")
+    parser.add_argument("--output", default=os.getenv("TRACKING_WAREHOUSE_DIR", ".warehouse/tracking"))
+    parser.add_argument("--season", default=os.getenv("DEFAULT_SEASON", "2025-26"))
+    parser.add_argument("--season-types", default=",".join(SEASON_TYPES), help="Comma separated season types")
+    parser.add_argument("--measures", default=",".join(DEFAULT_MEASURES), help="Comma separated pt_measure_type values")
+    parser.add_argument("--date", default="", help="Last YYYY-MM-DD date to ingest (default: yesterday)")
+    parser.add_argument("--days", type=int, default=3, help="Days ending at --date to (re)check")
+    parser.add_argument("--backfill", action="store_true", help="Ingest every missing day since the season start")
+    parser.add_argument("--force", action="store_true", help="Re-fetch days that are already ingested")
+    args = parser.parse_args()
+
+    end = date.fromisoformat(args.date) if args.date else date.today() - timedelta(days=1)
+    season_types = [x.strip() for x in args.season_types.split(",") if x.strip()]
+    measures = [x.strip() for x in args.measures.split(",") if x.strip()]
+    db_path = Path(args.output).resolve() / f"{args.season}.sqlite3"
+    conn = open_warehouse(db_path)
+    limiter = RateLimiter(float(os.getenv("UPSTREAM_MIN_INTERVAL_SECONDS", "0.6")))
+
+    fetched = 0
+    skipped = 0
+    for season_type in season_types:
+        for day in target_days(args.season, season_type, end, max(1, args.days), args.backfill):
+            for measure in measures:
+                done = conn.execute(
+                    "SELECT 1 FROM ingest_log WHERE season_type = ? AND measure = ? AND game_date = ?",
+                    (season_type, measure, day.isoformat()),
+                ).fetchone()
+                # The most recent day is always re-checked in case stats were corrected.
+                if done and not args.force and day != end:
+                    skipped += 1
+                    continue
+                count = ingest_day(conn, args.season, season_type, measure, day, limiter)
+                fetched += 1
+                print(f"[build] tracking {args.season} {season_type} {measure} {day.isoformat()}: {count} rows", flush=True)
+
+    print(
+        f"[build] tracking done: {fetched} days fetched, {skipped} already ingested,"
+        f" {limiter.calls} upstream calls, {limiter.retries} retries -> {db_path}",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
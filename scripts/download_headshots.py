@@ -2,53 +2,210 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import requests
 
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def manifest_players_files(data_dir: Path) -> dict[str, Path]:
+    # Players file of every season listed in the manifest; entries are {"path": ...} or a bare path.
+    manifest = json.loads((data_dir / "manifest.json").read_text(encoding="utf-8"))
+    out: dict[str, Path] = {}
+    for season, entry in (manifest.get("files", {}).get("players") or {}).items():
+        rel = entry.get("path") if isinstance(entry, dict) else entry
+        path = data_dir / str(rel or "")
+        if not rel or not path.exists():
+            print(f"[warn] players file for {season} missing: {path}", flush=True)
+            continue
+        out[season] = path
+    return out
+
+
+def manifest_player_ids(data_dir: Path) -> set[int]:
+    return set().union(*(players_file_ids(path) for path in manifest_players_files(data_dir).values()))
+
+
+def players_file_ids(path: Path) -> set[int]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    out = set()
+    for p in payload.get("players", []):
+        try:
+            pid = int(p.get("player_id") or 0)
+        except (TypeError, ValueError):
+            continue
+        if pid > 0:
+            out.add(pid)
+    return out
+
+
+def load_index(path: Path, size: str) -> dict[str, dict[str, Any]]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    # Validators recorded for another size path do not apply to these URLs.
+    return payload.get("files", {}) if payload.get("size") == size else {}
+
+
+def save_index(path: Path, size: str, files: dict[str, dict[str, Any]]) -> None:
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(
+        json.dumps({"size": size, "files": dict(sorted(files.items(), key=lambda kv: int(kv[0])))}, indent=1),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+class Downloader:
+    # One requests.Session per worker thread. Files already on disk are revalidated with the
+    # ETag / Last-Modified the CDN returned last time, so an unchanged headshot costs a 304.
+
+    def __init__(self, base_url: str, out_dir: Path, index: dict[str, dict[str, Any]], retries: int, timeout: float):
+        self.base_url = base_url
+        self.out_dir = out_dir
+        self.index = index
+        self.retries = max(0, retries)
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.counts = {"downloaded": 0, "unchanged": 0, "missing": 0, "failed": 0, "retries": 0}
+        self.bytes = 0
+
+    def session(self) -> requests.Session:
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+            session.headers.update({"User-Agent": "Mozilla/5.0"})
+        return session
+
+    def count(self, key: str, nbytes: int = 0) -> None:
+        with self.lock:
+            self.counts[key] += 1
+            self.bytes += nbytes
+
+    def fetch(self, pid: int) -> None:
+        target = self.out_dir / f"{pid}.png"
+        with self.lock:
+            known = dict(self.index.get(str(pid)) or {})
+        headers = {}
+        if target.exists() and target.stat().st_size > 0:
+            if known.get("etag"):
+                headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                headers["If-Modified-Since"] = known["last_modified"]
+
+        for attempt in range(self.retries + 1):
+            try:
+                resp = self.session().get(f"{self.base_url}/{pid}.png", headers=headers, timeout=self.timeout)
+            except requests.RequestException as err:
+                status, detail = None, str(err)
+            else:
+                status, detail = resp.status_code, f"HTTP {resp.status_code}"
+                if status not in RETRY_STATUS:
+                    break
+            if attempt < self.retries:
+                self.count("retries")
+                time.sleep(min(30.0, 0.5 * 2**attempt) + random.uniform(0, 0.25))
+        else:
+            print(f"[warn] headshot {pid}: {detail}", flush=True)
+            self.count("failed")
+            return
+
+        if status == 304:
+            self.count("unchanged", len(resp.content))
+            return
+        if status == 404:
+            self.count("missing")
+            return
+        if not resp.ok or not resp.content:
+            print(f"[warn] headshot {pid}: {detail}", flush=True)
+            self.count("failed")
+            return
+
+        body = resp.content
+        digest = hashlib.sha256(body).hexdigest()
+        # A CDN edge without validators can still answer 200 with the same bytes.
+        changed = known.get("sha256") != digest or not target.exists()
+        if changed:
+            tmp = target.with_name(f"{target.name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, target)
+        with self.lock:
+            self.index[str(pid)] = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "sha256": digest,
+                "bytes": len(body),
+            }
+        self.count("downloaded" if changed else "unchanged", len(body))
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Download NBA player headshots into frontend/public/headshots")
-    parser.add_argument("--players-json", default="frontend/public/data/players/2025-26.json")
+    parser.add_argument("--data-dir", default="frontend/public/data", help="Static data directory holding manifest.json")
+    parser.add_argument(
+        "--players-json",
+        action="append",
+        default=[],
+        help="Read player ids from this players file instead of the manifest (repeatable)",
+    )
     parser.add_argument("--out-dir", default="frontend/public/headshots")
     parser.add_argument("--size", default="260x190", help="NBA CDN headshot size path, e.g. 260x190 or 1040x760")
+    parser.add_argument("--base-url", default="https://cdn.nba.com/headshots/nba/latest")
+    parser.add_argument(
+        "--index",
+        default="",
+        help="ETag index used for conditional requests (default: .cache/headshots/etags.json)",
+    )
+    parser.add_argument("--workers", type=int, default=int(os.getenv("HEADSHOT_WORKERS", "16")))
+    parser.add_argument("--retries", type=int, default=3, help="Retries per headshot on network errors and 429/5xx")
+    parser.add_argument("--timeout", type=float, default=30.0)
     args = parser.parse_args()
 
-    players_json = Path(args.players_json)
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
+    # Kept out of out_dir: everything under frontend/public is published with the site.
+    index_path = Path(args.index) if args.index else Path(".cache/headshots/etags.json")
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    legacy_index = out_dir / ".etags.json"
+    if not args.index and legacy_index.exists():
+        if not index_path.exists():
+            os.replace(legacy_index, index_path)
+        else:
+            legacy_index.unlink()
 
-    payload = json.loads(players_json.read_text(encoding="utf-8"))
-    players = payload.get("players", [])
-
-    session = requests.Session()
-    session.headers.update({"User-Agent": "Mozilla/5.0"})
+    if args.players_json:
+        player_ids = set().union(*(players_file_ids(Path(p)) for p in args.players_json))
+    else:
+        player_ids = manifest_player_ids(Path(args.data_dir))
 
-    ok = 0
-    fail = 0
-    for p in players:
-        pid = int(p.get("player_id") or 0)
-        if pid <= 0:
-            continue
-        target = out_dir / f"{pid}.png"
-        if target.exists() and target.stat().st_size > 0:
-            ok += 1
-            continue
-        url = f"https://cdn.nba.com/headshots/nba/latest/{args.size}/{pid}.png"
-        try:
-            resp = session.get(url, timeout=30)
-            if resp.ok and resp.content:
-                target.write_bytes(resp.content)
-                ok += 1
-            else:
-                fail += 1
-        except Exception:
-            fail += 1
+    index = load_index(index_path, args.size)
+    started = time.monotonic()
+    downloader = Downloader(f"{args.base_url.rstrip('/')}/{args.size}", out_dir, index, args.retries, args.timeout)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            list(pool.map(downloader.fetch, sorted(player_ids)))
+    finally:
+        save_index(index_path, args.size, downloader.index)
 
-    print(f"downloaded_or_existing={ok} failed={fail} out_dir={out_dir}")
+    counts = downloader.counts
+    print(
+        f"players={len(player_ids)} downloaded={counts['downloaded']} unchanged={counts['unchanged']}"
+        f" missing={counts['missing']} failed={counts['failed']} retries={counts['retries']}"
+        f" bytes={downloader.bytes} in {time.monotonic() - started:.1f}s out_dir={out_dir}",
+        flush=True,
+    )
 
 
 if __name__ == "__main__":
     main()
-